@@ -9,6 +9,7 @@ Imports:
     from .text import Doc, Span: Imports the Doc and Span classes from the text module.
     from .hyper import edge2txt: Imports the edge2txt function from the hyper module.
 """
+import io
 
 from .svg.blocks import SVGBlockSent, SVGBlockSentAnno, SVGBlockHyperedge
 from .text import Doc, Span
@@ -20,6 +21,11 @@ class SVGCanvas():
 
     Attributes:
         template (str): The SVG template string with placeholders for width, height, font size, and colors.
+        header (str): The part of the template before the content placeholder.
+        footer (str): The part of the template after the content placeholder.
+        header_style (str): The part of the header before the colors placeholder.
+        header_defs (str): The part of the header after the colors placeholder (arrow marker definitions).
+        default_colors (dict): The colors used when none are given, copied into each canvas.
 
     Methods:
         __init__(self, width, height, font_size): Initializes the SVGCanvas with specified width, height, and font size.
@@ -65,6 +71,16 @@ class SVGCanvas():
     {content}
 </svg>
 """
+    header, footer = template.split("{content}")
+    header_style, header_defs = header.split("{colors}")
+    _defs_by_font_height = {}
+
+    default_colors = {"word": "black",
+                      "lemma": "grey",
+                      "ent": "blue",
+                      "srl": "green",
+                      "coref": "red"}
+    _default_colors_css = " ".join([f".{cls} {{fill: {color}}}" for cls, color in default_colors.items()])
 
     def  __init__(self, font_height, font_width, offset, margin=0, row_pad=0, col_pad=0, colors=None):
         """
@@ -89,11 +105,7 @@ class SVGCanvas():
 
         self.colors = colors
         if self.colors is None:
-            self.colors = {"word": "black",
-                           "lemma": "grey",
-                           "ent": "blue",
-                           "srl": "green",
-                           "coref": "red"}
+            self.colors = dict(self.default_colors)
         
 
 
@@ -108,6 +120,23 @@ class SVGCanvas():
         self.width = max(block.width + 2 * self.margin, self.width)
         self.height += block.height + self.margin
 
+    def _generate_defs(self):
+        """
+        Generates the arrow marker definitions, formatted once per font height.
+
+        Returns:
+            str: The header part of the template after the colors.
+        """
+        defs = self._defs_by_font_height.get(self.font_height)
+        if defs is None:
+            arrow_width = self.font_height * 0.7
+            arrow_height = arrow_width * 0.7
+            arrow_half_height = arrow_height / 2
+            defs = self.header_defs.format(arrow_width=arrow_width, arrow_height=arrow_height,
+                                           arrow_half_height=arrow_half_height)
+            self._defs_by_font_height[self.font_height] = defs
+        return defs
+
     def generate(self):
         """
         Generates the SVG content for the canvas.
@@ -115,23 +144,23 @@ class SVGCanvas():
         Returns:
             str: The generated SVG content as a string.
         """        
+        if self.colors == self.default_colors:
+            colors = self._default_colors_css
+        else:
+            colors = " ".join([f".{cls} {{fill: {color}}}" for cls, color in self.colors.items()])
+
+        buf = io.StringIO()
+        buf.write(self.header_style.format(width=self.width, height=self.height,
+                                           font_size=self.font_height))
+        buf.write(colors)
+        buf.write(self._generate_defs())
         dy = self.margin
         dx = self.margin
-        content = ""
         for block in self._blocks:
-            content += block.generate(dx=dx, dy=dy)
+            block.generate(dx=dx, dy=dy, buf=buf)
             dy += block.height + self.margin
-
-        arrow_width = self.font_height * 0.7
-        arrow_height = arrow_width * 0.7
-        arrow_half_height = arrow_height / 2
-
-        colors = " ".join(f".{cls} {{fill: {color}}}" for cls, color in self.colors.items())
-        svg = self.template.format(width=self.width, height=self.height, 
-                                   font_size=self.font_height, 
-                                   arrow_width=arrow_width, arrow_height=arrow_height, arrow_half_height=arrow_half_height,
-                                   colors=colors, content=content)
-        return svg
+        buf.write(self.footer)
+        return buf.getvalue()
     
 
 def draw_text(doc_or_sents, show_spans=True, annos=None, sent_text=True, font_height=16, font_width=16*0.6, offset=5, margin=0, row_pad=0, col_pad=0):
@@ -168,12 +197,9 @@ def draw_text(doc_or_sents, show_spans=True, annos=None, sent_text=True, font_he
         sents = doc_or_sents
 
     for sent in sents:
-        sent = Span(sent.doc, sent.start, sent.end)
+        sent = Span.fast(sent.doc, sent.start, sent.end)
         
-        if sent_text:
-            block = SVGBlockSent(canvas, sent)
-            canvas.add(block)
-        block = SVGBlockSentAnno(canvas, sent, show_spans=show_spans, annos=annos)
+        block = SVGBlockSentAnno(canvas, sent, show_spans=show_spans, annos=annos, sent_text=sent_text)
         canvas.add(block)
     
     return canvas.generate()
@@ -214,8 +240,12 @@ def save(filename, content):
 
     Args:
         filename (str): The name of the file to save the content to.
-        content (str): The content to save to the file.
+        content (str or iterable of str): The content to save to the file, 
+            either as a single string or as fragments written one after another.
     """
-    with open(filename, "w") as fp:
-        fp.write(content)
+    with open(filename, "wb", buffering=1 << 17) as fp:
+        if isinstance(content, str):
+            fp.write(content.encode("utf-8"))
+        else:
+            fp.writelines(fragment.encode("utf-8") for fragment in content)
 
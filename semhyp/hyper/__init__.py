@@ -1,87 +1,152 @@
+import warnings
+
 from .hyperedge import Atom, Hyperedge, hatom, hedge
 
+
+def _are_equal(arg1, arg2):
+    if isinstance(arg1, type(arg2)):
+        return arg1 == arg2
+    return False
+
+
+def _join(args, sep=" "):
+    return sep.join(args)
+
+
+def _txt_J(conn, args, txt_conn, txt_args, subedge):
+    return _join([_join(txt_args[:-1], ","), txt_conn, txt_args[-1]])
+
+def _txt_Ml(conn, args, txt_conn, txt_args, subedge):
+    return _join(txt_args + [txt_conn])
+
+def _txt_TM(conn, args, txt_conn, txt_args, subedge):
+    return _join([txt_conn] + txt_args)
+
+def _txt_Bp(conn, args, txt_conn, txt_args, subedge):
+    txt_args[0] += txt_conn
+    return _join(txt_args)
+
+def _txt_Jc(conn, args, txt_conn, txt_args, subedge):
+    return txt_args[0]
+
+def _txt_B(conn, args, txt_conn, txt_args, subedge):
+    return _join(txt_args)
+
+_lr_roles_cache = {}  # roles -> lr roles, role tuples repeat across predicates
+
+def _derive_lr_roles(roles):
+    lr_roles = _lr_roles_cache.get(roles)
+    if lr_roles is None:
+        num = str(min([int(r) for r in roles[-1] if r.isdigit()] + [9]))
+        lefts = "_s" + num
+        lr_roles = _lr_roles_cache[roles] = "".join(["l" if r in lefts else "r" for r in roles[0]])
+    return lr_roles
+
+def _txt_P(conn, args, txt_conn, txt_args, subedge):
+    #roles = conn.predicate_atom().argroles().split(":") # dep srl proto lr
+    roles = conn.argroles() # dep srl proto lr
+    if not roles:
+        roles = ("r" * len(args),)
+
+    num_roles = len(roles)
+    if len(roles) > 1:
+        dep_roles, *_, lr_roles = roles
+    else:
+        dep_roles = roles[0]
+        lr_roles = "r" * len(dep_roles)
+
+    # if there is no lr_role, make it from the last
+    if num_roles < 4: 
+        lr_roles = _derive_lr_roles(roles)
+
+    lefts, rights = [], []
+    for dep_role, lr_role, arg, txt_arg in zip(dep_roles, lr_roles, args, txt_args):
+        if dep_role == "-":
+            if not _are_equal(arg, subedge):
+                continue
+        if lr_role == "l":
+            lefts.append(txt_arg)
+        elif lr_role == "r":
+            rights.append(txt_arg)
+
+    return  _join(lefts + [txt_conn] + rights)
+
+# EXTRA
+def _txt_Jr(conn, args, txt_conn, txt_args, subedge):
+    return _join(txt_args)
+
+def _txt_C(conn, args, txt_conn, txt_args, subedge):
+    return _join([txt_conn] + txt_args)
+
+
+# text rules by exact connector type, then by its main type
+_HANDLERS = {"J": _txt_J,
+             "Ml": _txt_Ml,
+             "Bp": _txt_Bp,
+             "Jc": _txt_Jc,
+             "B": _txt_B,
+             "Br": _txt_B,
+             "Ba": _txt_B,
+             "Jr": _txt_Jr,
+             "C": _txt_C}
+
+_PREFIX_HANDLERS = {"T": _txt_TM,
+                    "M": _txt_TM,
+                    "P": _txt_P}
+
+
+# marks a relative clause rendered as its clause with the head as subedge
+_AROUND_HEAD = object()
+
+
 def edge2txt(edge, subedge=None):
+    cache = {}  # (id(edge), id(subedge)) -> txt, repeated subedges are rendered once
+    no_subedge = id(None)
 
-    def are_equal(arg1, arg2):
-        if isinstance(arg1, type(arg2)):
-            return arg1 == arg2
-        return False
+    # post-order traversal, an edge is pushed back with its handler once its parts are queued
+    root_key = (id(edge), id(subedge))
+    stack = [(edge, subedge, None)]
+    while stack:
+        edge, subedge, handler = stack.pop()
+        key = (id(edge), id(subedge))
 
+        if handler is not None:
+            if handler is _AROUND_HEAD:
+                cache[key] = cache[(id(edge[2]), id(edge[1]))]
+            else:
+                conn, *args = edge
+                txt_conn = cache[(id(conn), no_subedge)]
+                txt_args = [cache[(id(arg), no_subedge)] for arg in args]
+                cache[key] = handler(conn, args, txt_conn, txt_args, subedge)
+            continue
 
-    def join(args, sep=" "):
-        return sep.join(args)
-    
-    if edge.is_atom():
-        return edge.label()
-    
-    conn, *args = edge
-    txt_conn = edge2txt(conn)
-    txt_args = [edge2txt(arg) for arg in args]
-    conn_type = conn.type()
+        if key in cache:
+            continue
 
-    if conn_type == "J":
-        return join([join(txt_args[:-1], ","), txt_conn, txt_args[-1]])
+        if edge.is_atom():
+            cache[key] = edge.label()
+            continue
     
-    if conn_type == "Ml":
-        return join(txt_args + [txt_conn])
+        conn, *args = edge
+        conn_type = conn.type()
 
-    if conn_type[0] in ("T", "M"):
-        return join([txt_conn] + txt_args)
-    
-    if conn_type == "Bp":
-        txt_args[0] += txt_conn
-        return join(txt_args)   
-    
-    if conn_type == "Jc":
-        return txt_args[0]
-
-    if conn_type in ("B", "Br", "Ba"):
-        return join(txt_args)
-                
-    if conn_type[0] == "P":
-        #roles = conn.predicate_atom().argroles().split(":") # dep srl proto lr
-        roles = conn.argroles() # dep srl proto lr
-        if not roles:
-            roles = ("r" * len(args),)
-        
-        num_roles = len(roles)
-        if len(roles) > 1:
-            dep_roles, *_, lr_roles = roles
-        else:
-            dep_roles = roles[0]
-            lr_roles = "r" * len(dep_roles)
-
-        # if there is no lr_role, make it from the last
-        if num_roles < 4: 
-            lr_roles = ""
-            num = str(min([int(r) for r in roles[-1] if r.isdigit()] + [9]))
-            for r in roles[0]:
-                lr_roles += "l" if r in "_s" + num else "r"
-        
-        lefts, rights = [], []
-        for dep_role, lr_role, arg, txt_arg in zip(dep_roles, lr_roles, args, txt_args):
-            if dep_role == "-":
-                if not are_equal(arg, subedge):
-                    continue
-            if lr_role == "l":
-                lefts.append(txt_arg)
-            elif lr_role == "r":
-                rights.append(txt_arg)
-
-        return  join(lefts + [txt_conn] + rights)
-    
+        # relative clause which already contains its head is rendered around it
+        if conn_type == "Jr" and args[0] in args[1]:
+            stack.append((edge, subedge, _AROUND_HEAD))
+            stack.append((args[1], args[0], None))
+            continue
 
-    # EXTRA
-    if conn_type == "Jr":
-        if args[0] not in args[1]:
-            return join(txt_args)
-        return edge2txt(args[1], args[0])
-    
-    if conn_type == "C":
-        return join([txt_conn] + txt_args)
+        handler = _HANDLERS.get(conn_type) or _PREFIX_HANDLERS.get(conn_type[0])
+        if handler is None:
+            warnings.warn(f"edge2txt: no text rule for {conn} of type {conn_type}.")
+            cache[key] = "???"
+            continue
 
-    
-    print("???", conn, conn_type)
-    #raise Exception(f"Write IF THEN for {conn}")
+        stack.append((edge, subedge, handler))
+        for item in reversed(edge):
+            if item.is_atom():
+                cache[(id(item), no_subedge)] = item.label()
+            else:
+                stack.append((item, None, None))
 
-        
+    return cache[root_key]
@@ -1,3 +1,5 @@
+import re
+import sys
 from collections import namedtuple
 
 
@@ -15,33 +17,39 @@ atom_part_encoding = {
     '\r': '%0d',
 }
 
+_special_chars = frozenset(atom_part_encoding)
+_encode_table = str.maketrans(atom_part_encoding)
+_decode_map = {v: k for k, v in atom_part_encoding.items()}
+_decode_regex = re.compile("|".join(re.escape(v) for v in atom_part_encoding.values()))
+_hedge_token_regex = re.compile(r"\(|\)|[^\s()]+")
+
+# marks a cached edge property that is not inferred yet (argroles can be None)
+_UNSET = object()
+
 def hatom(source):
     source = source.strip()
-    label, *rest = source.split("/")
-    if not rest:
-        return Atom(label)
+    label, slash, parts = source.partition("/")
+    label = sys.intern(str2part(part2str(label)))  # canonical encoding
+    if not slash:
+        return Atom._fast(label)
     
-    parts = rest.pop().split(".")
-    return Atom(label, *parts)
+    parts = parts.rpartition("/")[2]  # parts are after the last slash
+    return Atom._fast(label, *_encoded_atom_parts(parts))
 
 
 def hedge(source):
-    source = source.replace("(", " ( ").replace(")", " ) ").strip()
-    source = source.split()
-    
-    for i in range(len(source)):
-        if source[i] not in "()":
-            source[i] = hatom(source[i])
-
     stack = []
-    for item in source:
-        if item == ")":
-            queue = []
-            while stack[-1] != "(":
-                queue.append(stack.pop())
-            stack[-1] = Hyperedge(queue[::-1])
+    opened = []  # positions in stack where open parentheses start
+    for token in _hedge_token_regex.findall(source):
+        if token == "(":
+            opened.append(len(stack))
+        elif token == ")":
+            start = opened.pop()
+            edge = Hyperedge(stack[start:])
+            del stack[start:]
+            stack.append(edge)
         else:
-            stack.append(item)
+            stack.append(hatom(token))
 
     return stack.pop()
 
@@ -53,8 +61,14 @@ class Hyperedge(tuple):
 
     def type(self):
         """Returns the type of this edge as a string.
-        Type inference is performed.
+        Type inference is performed once, the result is cached on the edge.
         """
+        edge_type = getattr(self, "_type", _UNSET)
+        if edge_type is _UNSET:
+            edge_type = self._type = sys.intern(self._infer_type())
+        return edge_type
+
+    def _infer_type(self):
         ptype = self[0].type()
         if ptype[0] == 'P':
             outter_type = 'R'
@@ -91,6 +105,12 @@ class Hyperedge(tuple):
         (not/M is/P.sc) has argument roles "sc",
         of/B.ma has argument roles "ma".
         """
+        argroles = getattr(self, "_argroles", _UNSET)
+        if argroles is _UNSET:
+            argroles = self._argroles = self._infer_argroles()
+        return argroles
+
+    def _infer_argroles(self):
         et = self.mtype()
         if et in {'R', 'C'} and self[0].mtype() in {'B', 'P'}:
             return self[0].argroles()
@@ -110,13 +130,17 @@ class Hyperedge(tuple):
         return atom_set    
     
     def subedges(self):
-        edges = {self}
-        for item in self:
-            edges = edges.union(item.subedges())
+        edges = set()
+        self._collect_subedges(edges)
         return edges
 
+    def _collect_subedges(self, edges):
+        edges.add(self)
+        for item in self:
+            item._collect_subedges(edges)
+
     def to_str(self):
-        return "(" + " ".join(edge.to_str() for edge in self) + ")"
+        return "(" + " ".join([edge.to_str() for edge in self]) + ")"
 
     def __str__(self):
         return self.to_str()
@@ -199,39 +223,59 @@ class Hyperedge(tuple):
 
 
 def str2part(s):
-    for k, v in atom_part_encoding.items():
-        s = s.replace(k, v)
-    return s
+    if _special_chars.isdisjoint(s):
+        return s
+    return s.translate(_encode_table)
 
 def part2str(part):
-    for k, v in atom_part_encoding.items():
-        part = part.replace(v, k)
-    return part    
+    if "%" not in part:
+        return part
+    return _decode_regex.sub(lambda m: _decode_map[m.group(0)], part)
+
 
+_atom_part_cache = {}  # str part -> encoded tuple, shared by all atoms with that part
+_atom_part_classes = {}  # dict part keys -> namedtuple class
+_encoded_atom_parts_cache = {}  # serialized (encoded) parts -> tuple of encoded parts
 
 def build_atom_part(part):
     if part is None:
         return None
 
-    if isinstance(part, str) and ":" not in part:
-        return (str2part(part), )
-
-    if isinstance(part, str) and ":" in part:
-        part = part.split(":")
+    if isinstance(part, str):
+        encoded = _atom_part_cache.get(part)
+        if encoded is None:
+            encoded = _atom_part_cache[part] = tuple(sys.intern(str2part(p)) for p in part.split(":"))
+        return encoded
 
     if isinstance(part, (tuple, list)) and all(isinstance(p, str) for p in part):
         return tuple(str2part(p) for p in part)
     
     if isinstance(part, dict) and all(isinstance(k, str) and isinstance(v, str) for k, v in part.items()):
-        return namedtuple("Part", list(part))(*(str2part(p) for p in part.values()))
+        keys = tuple(part)
+        part_class = _atom_part_classes.get(keys)
+        if part_class is None:
+            part_class = _atom_part_classes[keys] = namedtuple("Part", keys)
+        return part_class(*(str2part(p) for p in part.values()))
 
     return str(part)
 
 
+def _encoded_atom_parts(parts):
+    encoded = _encoded_atom_parts_cache.get(parts)
+    if encoded is None:
+        encoded = _encoded_atom_parts_cache[parts] = tuple(build_atom_part(part2str(part)) for part in parts.split("."))
+    return encoded
+
+
 class Atom(Hyperedge):
 
     def __new__(cls, label, type=None, roles=None, morph=None, entity=None):
-        return super(Hyperedge, cls).__new__(cls, (str2part(label), build_atom_part(type), build_atom_part(roles), build_atom_part(morph), build_atom_part(entity)))
+        return super(Hyperedge, cls).__new__(cls, (sys.intern(str(str2part(label))), build_atom_part(type), build_atom_part(roles), build_atom_part(morph), build_atom_part(entity)))
+
+    @classmethod
+    def _fast(cls, label, type=None, roles=None, morph=None, entity=None):
+        """Builds an atom from an encoded label and already built parts."""
+        return super(Hyperedge, cls).__new__(cls, (label, type, roles, morph, entity))
 
     def label(self):
         return part2str(self[0])
@@ -286,6 +330,9 @@ class Atom(Hyperedge):
     
     def subedges(self):
         return {self}
+
+    def _collect_subedges(self, edges):
+        edges.add(self)
     
     def atoms(self):
         return {self}
@@ -294,19 +341,21 @@ class Atom(Hyperedge):
         txt = part2str(self[0])
 
         rest = []
+        last = 0  # number of parts up to the last non-empty one
         for part in self[1:]:
             if part is None:
                 rest.append("")
-            elif isinstance(part, tuple):
-                rest.append(":".join(part2str(p) for p in part))
+                continue
+            if isinstance(part, tuple):
+                rest.append(":".join([part2str(p) for p in part]))
             else:
                 rest.append(part2str(part))
-        
-        while rest and rest[-1] == "":
-            rest.pop()
+            if rest[-1]:
+                last = len(rest)
 
-        if not rest:
+        if not last:
             return txt
+        rest = rest[:last]
 
         if with_label:
             return txt + "/" + ".".join(rest)
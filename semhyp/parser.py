@@ -1,19 +1,52 @@
 from typing import List, Tuple, Dict
+from operator import attrgetter
 from .text import Token, Span, Doc
 from .hyper.hyperedge import Atom, UniqueAtom, Hyperedge as Edge
 import warnings
 
-def alpha_condition(tok: Token) -> bool:
-    return ((tok.head.dep not in {"prep"} and 
-             tok.dep in {"case", "det", "predet", 
+# dependency and POS groups shared by the atom and hyperedge rules
+_ALPHA_DEPS = frozenset({"case", "det", "predet", 
                          "amod", "nummod", "nmod", "quantmod", "compound", 
-                         "aux", "auxpass", "prt", "neg"}) 
+                         "aux", "auxpass", "prt", "neg"})
+_NON_ARG_DEPS = _ALPHA_DEPS | {"cc", "mark", 
+                               "dep", "punct", "meta"}
+_ADVERBIAL_DEPS = frozenset({"advmod", "npadvmod"})
+_AUX_DEPS = frozenset({"aux", "auxpass"})
+_CLAUSE_DEPS = frozenset({"acl", "relcl"})
+_CORE_ARG_DEPS = frozenset({"nsubj", "nsubjpass", "dobj", "dative", "oprd",
+                            "acomp", "attr", "expl", "csubj", "csubjpass",
+                            "parataxis", "intj"})
+_COMP_DEPS = frozenset({"ccomp", "xcomp", "advcl"})
+_MARK_PREP_DEPS = frozenset({"mark", "prep"})
+_OBJ_DEPS = frozenset({"pobj", "pcomp"})
+_MOD_DEPS = frozenset({"det", "predet", "amod", "advmod", "nmod", "nummod", "npadvmod", "quantmod"})
+_RESIDUAL_DEPS = frozenset({"dep", "meta"})
+_NOMINAL_POS = frozenset({"NOUN", "PROPN"})
+_PRED_POS = frozenset({"VERB", "AUX", "MD"})
+
+_tok_index = attrgetter("i")
+
+def alpha_condition(tok: Token) -> bool:
+    return ((tok.head.dep != "prep" and 
+             tok.dep in _ALPHA_DEPS) 
              or
-            (tok.dep in {"advmod", "npadvmod"} and 
-             tok.head.pos not in {"VERB", "AUX", "MD"}) 
+            (tok.dep in _ADVERBIAL_DEPS and 
+             tok.head.pos not in _PRED_POS) 
              or
             (tok.head.pos == tok.pos == "X"))
 
+def _get_alphas(sent: Span) -> Dict[int, bool]:
+    """
+    Evaluates `alpha_condition` once for every token of the sentence.
+
+    Args:
+        sent (Span): A sentence (as a `Span` object) from a document.
+
+    Returns:
+        dict: Token index mapped to the result of `alpha_condition`.
+    """
+    return {tok.i: alpha_condition(tok) for tok in sent}
+
 ALPHA_PRIORS = {"prt": 3,
                 "aux": 2,
                 "auxpass": 2,
@@ -37,7 +70,25 @@ BETA_PRIORS = {"mark": -1,
             #    "agent": -5,
               }
 
-def make_token_sequence(sent: Span) -> List[Tuple[int, int, int]]:
+_BETA_BELOW_MIN = min(BETA_PRIORS.values()) - 1
+
+def _seq_kernel(depths: List[int], priors: List[int], dists: List[int]) -> List[int]:
+    """
+    Orders positions by (-depth, -prior, dist), ties keeping their original order.
+
+    Every key is packed into a single int (dist is never negative), so the sort
+    compares plain ints instead of tuples.
+    """
+    if not depths:
+        return []
+    prior_max = max(priors)
+    prior_span = prior_max - min(priors) + 1
+    dist_span = max(dists) + 1
+    keys = [(-depth * prior_span + prior_max - prior) * dist_span + dist
+            for depth, prior, dist in zip(depths, priors, dists)]
+    return sorted(range(len(keys)), key=keys.__getitem__)
+
+def make_token_sequence(sent: Span, alphas: Dict[int, bool] = None) -> List[Token]:
     """
     Creates a token sequence for a given sentence, assigning values based on
     syntactic distance, tree depth, and predefined priors for linguistic elements.
@@ -45,69 +96,88 @@ def make_token_sequence(sent: Span) -> List[Tuple[int, int, int]]:
     This function utilizes three helper functions:
     1. `_get_dist(tok)`: Computes the syntactic distance between a token and its head
        by either directly comparing indices or counting sibling tokens.
+       Siblings are numbered once per head.
     2. `_get_depth(tok)`: Determines the depth of a token in the dependency tree
        by counting the number of head relations between the token and the root.
+       Depths are memoized, so every head chain is walked only once.
     3. `_get_prior(tok)`: Assigns a prior value to a token based on its syntactic
        category. Special handling is given to tokens under certain conditions, such
        as conjunctions and dependency relationships.
 
     Args:
         sent (Span): A sentence (as a `Span` object) from a document.
+        alphas (dict, optional): Precomputed `alpha_condition` by token index (see `_get_alphas`).
 
     Returns:
-        list: A list of token features, including syntactic distance, tree depth, and prior value.
+        list: Non-punctuation tokens ordered by (-depth, -prior, distance).
     """
+    if alphas is None:
+        alphas = _get_alphas(sent)
+
+    sibling_pos = {}    # token index -> position among the non-alpha children of its head
+    sibling_count = {}  # head index -> number of non-alpha children
+
     def _get_dist(tok: Token) -> int:
-        if alpha_condition(tok):
+        if alphas[tok.i]:
             return abs(tok.i - tok.head.i)
         
         if tok.dep == "mark":  # (so(as 
             return abs(tok.i - tok.head.i)
         
-        dist = 0
-        for child in tok.head.children:
-            if alpha_condition(child):
-                continue
-            if child == tok:
-                return dist
-            dist += 1
+        dist = sibling_pos.get(tok.i)
+        if dist is None:
+            head = tok.head
+            if head.i not in sibling_count:
+                # number the non-alpha children of head once for all its siblings
+                n = 0
+                for child in head.children:
+                    if not alphas[child.i]:
+                        sibling_pos[child.i] = n
+                        n += 1
+                sibling_count[head.i] = n
+            dist = sibling_pos.get(tok.i, sibling_count[head.i])
         return dist
     
+    sent_root = sent.root
+    depth_cache = {sent_root.i: 0}  # token index -> depth, filled along every walked head chain
+
     def _get_depth(tok: Token) -> int:
-        depth = 0
+        path = []
         temp = tok
-        sent_root = tok.sent.root
-        while temp != sent_root:
+        while temp.i not in depth_cache:
+            path.append(temp)
             temp = temp.head
+        depth = depth_cache[temp.i]
+        for temp in reversed(path):
             depth += 1
-        return depth
+            depth_cache[temp.i] = depth
+        return depth_cache[tok.i]
     
     def _get_prior(tok: Token) -> int:
-        if alpha_condition(tok):
+        if alphas[tok.i]:
             return ALPHA_PRIORS.get(tok.dep, 0)
         
         beta = BETA_PRIORS.get(tok.dep, 0)
 
         # Vidi "The speed, power and versatility of computer..."
         # konjunkcije se nalaze iza "of"
-        if beta == 0 and tok.head.i < tok.i and tok.head.pos not in {"VERB", "AUX"}:
+        if beta == 0 and tok.head.i < tok.i and tok.head.pos != "VERB" and tok.head.pos != "AUX":
             conjs = tok.head.conjuncts
             if conjs:
-                last = max(conjs)
-                if last.i < tok.i:
-                    return min(BETA_PRIORS.values()) - 1
+                tok_i = tok.i
+                for conj in conjs:
+                    if conj.i >= tok_i:
+                        break
+                else:  # every conjunct precedes tok
+                    return _BETA_BELOW_MIN
 
         return beta
 
-    def _get_tok_attrs(tok: Token) -> Tuple[int, int, int]:
-        dist = _get_dist(tok)
-        prior = _get_prior(tok)
-        depth = _get_depth(tok)
-        return ((-depth, -prior, dist), tok)
-    
-    return sorted(_get_tok_attrs(tok)
-                  for tok in sent
-                  if tok.dep != "punct")
+    toks = [tok for tok in sent if tok.dep != "punct"]
+    dists = [_get_dist(tok) for tok in toks]
+    priors = [_get_prior(tok) for tok in toks]
+    depths = [_get_depth(tok) for tok in toks]
+    return [toks[i] for i in _seq_kernel(depths, priors, dists)]
 
 SRL_ROLES = {"ADJ": "a", 
              "ADV": "r", 
@@ -187,22 +257,23 @@ ENTITIES = {"CARDINAL": "c",
             "TIME": "t", 
             "WORK_OF_ART": "a"}
 
+_srl_role_cache = {}  # SRL label -> role, bounded by the label inventory
+
 def _convert_srl_role(label: str) -> str:
+    role = _srl_role_cache.get(label)
+    if role is not None:
+        return role
+
     if label[-1].isdigit():
-        return label[-1]
-    
-    role = label.split("-")[-1]
+        role = label[-1]
+    else:
+        role = SRL_ROLES.get(label.split("-")[-1], "?")
     
-    return SRL_ROLES.get(role, "?")
+    _srl_role_cache[label] = role
+    return role
 
 
-def _get_verb_args_by_srl_and_dep(verb: Token) -> Tuple[Dict[Token, str], Dict[Token, str]]:
-    deps = {"case", "det", "predet", 
-            "amod", "nummod", "nmod", "quantmod", "compound", 
-            "aux", "auxpass", "prt", "neg", 
-            "cc", "mark", 
-            "dep", "punct", "meta"}
-    
+def _get_verb_args_by_srl_and_dep(verb: Token) -> Tuple[Dict[Token, str], Dict[Token, str], List[Token]]:
     verbs = {verb}
 
     if verb.doc.srl:
@@ -218,21 +289,31 @@ def _get_verb_args_by_srl_and_dep(verb: Token) -> Tuple[Dict[Token, str], Dict[T
                     if span.root != v and 
                         span.label != "ARGM-LVB" and 
                         span.label != "ARGM-MOD" and 
-                        (span.root.dep not in deps or 
-                         (v.head == span.root and v.dep in {"relcl", "acl"}))}
+                        (span.root.dep not in _NON_ARG_DEPS or 
+                         (v.head == span.root and v.dep in _CLAUSE_DEPS))}
     else:
         srl_toks = {}
 
     dep_toks = {tok: tok.dep
                 for v in verbs
                 for tok in v.children 
-                if tok.dep not in deps}
+                if tok.dep not in _NON_ARG_DEPS}
     
-    return srl_toks, dep_toks
+    # arguments found by either SRL or dependency, in sentence order
+    toks = sorted({**srl_toks, **dep_toks}, key=_tok_index)
+
+    return srl_toks, dep_toks, toks
 
-def _get_predicate_roles(verb: Token) -> str:
-    srl_toks, dep_toks = _get_verb_args_by_srl_and_dep(verb)
-    toks = sorted(set(srl_toks) | set(dep_toks))
+def _get_cached_verb_args(verb: Token, cache: Dict[int, Tuple] = None) -> Tuple[Dict[Token, str], Dict[Token, str], List[Token]]:
+    if cache is None:
+        return _get_verb_args_by_srl_and_dep(verb)
+    args = cache.get(verb.i)
+    if args is None:
+        args = cache[verb.i] = _get_verb_args_by_srl_and_dep(verb)
+    return args
+
+def _get_predicate_roles(verb: Token, verb_args: Dict[int, Tuple] = None) -> str:
+    srl_toks, dep_toks, toks = _get_cached_verb_args(verb, verb_args)
     
     srl_args, proto_args, dep_args, lr_args = [], [], [], []
     for tok in toks:        
@@ -345,15 +426,25 @@ def _get_verb_features(token: Token) -> str:
     else:
         return features
     
-def _get_entity_features(tok: Token, *rest) -> str:
-    if tok.ent.tag: # and tok.ent_type_ != tok.head.ent_type_:
-        ent = ENTITIES.get(tok.ent.tag, "")
-        if not rest:
-            return ent
-        if all(ENTITIES.get(t.ent.tag, "") == ent for t in rest):
-            return ent
+def _get_entity_code(tok: Token) -> str:
+    tag = tok.ent.tag
+    if tag: # and tok.ent_type_ != tok.head.ent_type_:
+        return ENTITIES.get(tag, "")
     return ""
 
+def _get_entity_codes(sent: Span) -> Dict[int, str]:
+    return {tok.i: _get_entity_code(tok) for tok in sent}
+
+def _get_entity_features(tok: Token, *rest, codes: Dict[int, str] = None) -> str:
+    if codes is None:
+        codes = {t.i: _get_entity_code(t) for t in (tok, ) + rest}
+    ent = codes[tok.i]
+    if ent:
+        for t in rest:
+            if codes[t.i] != ent:
+                return ""
+    return ent
+
 def _get_appos_features(tok: Token) -> str:
     """
     - (r)estrictive / (n)ot restrictive
@@ -386,8 +477,9 @@ def _get_trigger_subtype(tok: Token) -> str:
         return "l"
     return ""
 
-def _get_directional_roles(tok: Token) -> str:
-    if not alpha_condition(tok):
+def _get_directional_roles(tok: Token, alphas: Dict[int, bool] = None) -> str:
+    is_alpha = alphas[tok.i] if alphas is not None else alpha_condition(tok)
+    if not is_alpha:
         return ""
     if tok.i < tok.head.i:
         return "<"
@@ -401,147 +493,144 @@ def _get_conj_closure(tok: Token) -> Token:
     return tok
 
 # SemHyP atom rules
+def _trigger_type(tok: Token) -> str:
+    return "T" + _get_trigger_subtype(tok)
+
+def _nmod_type(tok: Token) -> str:
+    if tok.pos == "X":
+        return "Cm"           # A3.1
+    return "M"                # A3.2
+
+def _npadvmod_type(tok: Token) -> str:
+    if tok.head.dep in _MARK_PREP_DEPS:
+        return "M"            # A12
+    return None
+
+def _poss_type(tok: Token) -> str:
+    if tok.pos not in _NOMINAL_POS:
+        return "Mp"           # Missing in paper, but if it is not a noun or proper noun, it should be treated as possessive determiner    
+    return None
+
+def _prep_type(tok: Token) -> str:
+    if tok.head.pos not in _PRED_POS and tok.head.dep != "prep":
+#         if tok.head.dep == "acomp":
+#             return "Jr.ma"
+        return "Br"           # A18.1
+    return "T" + _get_trigger_subtype(tok) # A18.2
+
+def _pron_type(tok: Token) -> str:
+    if tok.tag[0] == "W":
+        return "Cw"           # A22.1
+    return "Ci"               # A22.2
+
+def _predicate_type(tok: Token) -> str:
+    t = "P"                                 # A28.4
+    for child in tok.rights:
+        # depending on the punctuation, subtype can be different (the last one wins).
+        if child.dep == "punct":
+            if child.text in ".,;:":
+                t = "Pd"                    # A28.1 declarative
+            elif child.text == "?":
+                t = "P?"                    # A28.2 interrogative
+            elif child.text == "!":
+                t = "P!"                    # A28.3 exclamative
+    return t
+
+# Modification, conjunction and prepositional rules keyed by (dep, tag)
+_DEP_TAG_TYPES = {("amod", "JJR"): "Mc",     # A1.1
+                  ("amod", "JJS"): "Ms",     # A1.2
+                  ("det", "WDT"): "Mw",      # A4.1
+                  ("aux", "TO"): "Mi",       # A6.1
+                  ("auxpass", "TO"): "Mi",
+                  ("aux", "MD"): "Mm",       # A6.2
+                  ("auxpass", "MD"): "Mm",
+                  ("advmod", "RBR"): "M=",   # A7.1
+                  ("advmod", "RBS"): "M^",   # A7.2
+                  ("advmod", "WRB"): "Mw",   # Missing in paper, but it is a wh-adverb, so it should be treated as a determiner
+                  ("poss", "PRP$"): "Mp",    # A13.1
+                  ("poss", "PRP"): "Ci",     # A13.2
+                 }
+
+# ... keyed by dep only: a type or a resolver (None falls through to the residual rules)
+_DEP_TYPES = {"amod": "Ma",                  # A1.3 Ms in paper
+              "nummod": "M#",                # A2
+              "nmod": _nmod_type,            # A3
+              "det": "Md",                   # A4.2
+              "neg": "Mn",                   # A5
+              "aux": "Mv",                   # A6.3
+              "auxpass": "Mv",
+              "advmod": "M",                 # A7.3
+              "predet": "M",                 # A8
+              "quantmod": "M",               # A9
+              "prt": "Ml.r",                 # A10
+              "expl": "Me",                  # A11
+              "npadvmod": _npadvmod_type,    # A12
+              "poss": _poss_type,
+              "cc": "J",                     # A14
+              "preconj": "J",                # A15
+              "case": "Bp",                  # A16
+              "agent": _trigger_type,        # A17
+              "prep": _prep_type,            # A18.1, A18.2
+              "mark": _trigger_type,         # A18.3
+              "acomp": "Ca",                 # A1.4 Cm in paper
+             }
+
+# Residual rules keyed by pos
+_POS_TYPES = {"NOUN": "Cc",                  # A20
+              "PROPN": "Cp",                 # A21
+              "PRON": _pron_type,            # A22
+              "NUM": "C#",                   # A23
+              "DET": "Cd",                   # A24
+              "ADJ": "M",                    # A25
+              "ADP": _trigger_type,          # A26
+              "SCONJ": _trigger_type,        # A27
+              "VERB": _predicate_type,       # A28
+              "AUX": _predicate_type,
+              "MD": _predicate_type,
+             }
+
 def build_type_and_subtype(tok: Token) -> str:
-    if tok.dep == "conj":
+    dep = tok.dep
+    if dep == "conj":
         closure = _get_conj_closure(tok)
         if tok.tag == closure.tag:  # and tok.pos not in {"VERB"}:
             return build_type_and_subtype(closure)
-            
-    # Modification rules
-    if tok.dep == "amod":    
-        if tok.tag == "JJR":  
-            return "Mc"       # A1.1
-        if tok.tag == "JJS":  
-            return "Ms"       # A1.2  
-        return "Ma"           # A1.3 Ms in paper
-    if tok.dep == "nummod":   
-        return "M#"           # A2
-    if tok.dep == "nmod":
-        if tok.pos == "X":
-            return "Cm"       # A3.1
-        return "M"            # A3.2
-    if tok.dep == "det":
-        if tok.tag == "WDT":  
-            return "Mw"       # A4.1 
-        return "Md"           # A4.2
-    if tok.dep == "neg":      
-        return "Mn"           # A5 
-    if tok.dep in {"aux", "auxpass"}:
-        if tok.tag == "TO":
-            return "Mi"       # A6.1 
-        if tok.tag == "MD":
-            return "Mm"       # A6.2
-        return "Mv"           # A6.3
-    if tok.dep == "advmod":
-        if tok.tag == "RBR":
-            return "M="       # A7.1
-        if tok.tag == "RBS":
-            return "M^"       # A7.2
-        if tok.tag == "WRB":
-            return "Mw"       # Missing in paper, but it is a wh-adverb, so it should be treated as a determiner
-        return "M"            # A7.3
-    if tok.dep == "predet":   
-        return "M"            # A8 
-    if tok.dep == "quantmod":
-        return "M"            # A9
-    if tok.dep == "prt":
-        return "Ml.r"         # A10  
-    if tok.dep == "expl":
-        return "Me"           # A11
-    
-    if tok.dep == "npadvmod" and tok.head.dep in {"mark", "prep"}:
-        return "M"            # A12
-    
-    if tok.dep == "poss":
-        if tok.tag == "PRP$": # A13.1
-            return "Mp"
-        if tok.tag == "PRP":
-            return "Ci"       # A13.2 
-        if tok.pos not in {"NOUN", "PROPN"}:
-            return "Mp"       # Missing in paper, but if it is not a noun or proper noun, it should be treated as possessive determiner    
-    
-    # Conjunction rules
-    if tok.dep == "cc":
-        return "J"            # A14 
-    if tok.dep == "preconj":
-        return "J"            # A15
-        
-    # Prepositional rules
-    if tok.dep == "case":
-        return "Bp"           # A16
 
-    if tok.dep == "agent":
-        return "T" + _get_trigger_subtype(tok)  # A17
-    
-    if tok.dep == "prep":
-        if tok.head.pos not in {"VERB", "AUX", "MD"} and tok.head.dep not in {"prep"}:
-#             if tok.head.dep == "acomp":
-#                 return "Jr.ma"
-            return "Br"        # A18.1
-        
-        return "T" + _get_trigger_subtype(tok) # A18.2
+    t = _DEP_TAG_TYPES.get((dep, tok.tag))
+    if t is not None:
+        return t
 
-    if tok.dep == "mark":
-        return "T" + _get_trigger_subtype(tok) # A18.3
-    
-    if tok.dep == "acomp":  # A1.4 Cm in paper
-        return "Ca"
-    
-    # Residual rules
-    if tok.pos == "NOUN":
-        return "Cc"            # A20
-    if tok.pos == "PROPN":
-        return "Cp"            # A21
-    if tok.pos == "PRON":
-        if tok.tag[0] == "W":
-            return "Cw"        # A22.1
-        return "Ci"            # A22.2
-    if tok.pos == "NUM":
-        return "C#"            # A23
-    if tok.pos == "DET":
-        return "Cd"            # A24
-    
-    if tok.pos == "ADJ":
-        return "M"             # A25
-    if tok.pos == "ADP":
-        return "T" + _get_trigger_subtype(tok)  # A26
-    
-    if tok.pos == "SCONJ":
-        return "T" + _get_trigger_subtype(tok)  # A27
-    
-    if tok.pos in {"VERB", "AUX", "MD"}:
-        for child in reversed(list(tok.rights)):
-            # depending on the punctuation, subtype can be different.
-            if child.dep == "punct":
-                if child.text in ".,;:":
-                    return "Pd"                 # A28.1 declarative
-                if child.text == "?":
-                    return "P?"                 # A28.2 interrogative
-                if child.text == "!":
-                    return "P!"                 # A28.3 exclamative
-
-        return "P"                              # A28.4
-
-    return "C"
-
-def build_part(tok: Token) -> str:
+    t = _DEP_TYPES.get(dep)
+    if t is not None:
+        if t.__class__ is str:
+            return t
+        t = t(tok)
+        if t is not None:
+            return t
+
+    t = _POS_TYPES.get(tok.pos, "C")
+    if t.__class__ is str:
+        return t
+    return t(tok)
+
+def build_part(tok: Token, alphas: Dict[int, bool] = None, verb_args: Dict[int, Tuple] = None, ent_codes: Dict[int, str] = None) -> str:
     t = build_type_and_subtype(tok)
     r = f = e = ""
     
     if t[0] == "P":
-        r = _get_predicate_roles(tok)
+        r = _get_predicate_roles(tok, verb_args)
         f = _get_verb_features(tok)
-        e = _get_entity_features(tok)
+        e = _get_entity_features(tok, codes=ent_codes)
     elif t[0] == "C":
-        r = _get_directional_roles(tok)
+        r = _get_directional_roles(tok, alphas)
         f = _get_concept_features(tok)
-        e = _get_entity_features(tok)
+        e = _get_entity_features(tok, codes=ent_codes)
     elif t[0] == "M":
-        r = _get_directional_roles(tok)
+        r = _get_directional_roles(tok, alphas)
         f = _get_concept_features(tok)
-        e = _get_entity_features(tok)
+        e = _get_entity_features(tok, codes=ent_codes)
     elif t[0] != "P":
-        e = _get_entity_features(tok)
+        e = _get_entity_features(tok, codes=ent_codes)
     
     parts = [t, r, f, e]
     while not parts[-1]:
@@ -558,24 +647,54 @@ def is_atom(edge):
     return isinstance(edge, (Atom, UniqueAtom))
 
 def contains_atom(edge, atom):
-    if isinstance(edge, (Atom, UniqueAtom)):
-        return edge == atom
-    
-    return any(contains_atom(item, atom) for item in edge)    
+    stack = [edge]
+    while stack:
+        edge = stack.pop()
+        if isinstance(edge, (Atom, UniqueAtom)):
+            if edge == atom:
+                return True
+        else:
+            stack.extend(edge)
+    return False
+
+def _collect_atoms(edge):
+    atoms = set()
+    stack = [edge]
+    while stack:
+        edge = stack.pop()
+        if isinstance(edge, (Atom, UniqueAtom)):
+            atoms.add(edge)
+        else:
+            stack.extend(edge)
+    return atoms
 
 def edgify(edge):
     if isinstance(edge, (Atom, UniqueAtom)):
         return edge
-    return Edge([edgify(arg) for arg in edge])    
+    
+    # post-order: a nested list becomes an Edge once all its items are built
+    result = []
+    stack = [(iter(edge), result)]
+    while stack:
+        items, built = stack[-1]
+        for item in items:
+            if isinstance(item, (Atom, UniqueAtom)):
+                built.append(item)
+            else:
+                stack.append((iter(item), []))
+                break
+        else:
+            stack.pop()
+            if stack:
+                stack[-1][1].append(Edge(built))
+    return Edge(result)
 
 
-def _get_half_empty_toks(verb):
+def _get_half_empty_toks(verb, verb_args=None):
     
     is_toks = []
     
-    srl_toks, dep_toks = _get_verb_args_by_srl_and_dep(verb)
-
-    toks = sorted(set(srl_toks) | set(dep_toks))
+    srl_toks, dep_toks, toks = _get_cached_verb_args(verb, verb_args)
     
     for i, tok in enumerate(toks):
         if tok in srl_toks and tok not in dep_toks:
@@ -584,27 +703,290 @@ def _get_half_empty_toks(verb):
             is_toks.append((i, tok, "srl"))
     return is_toks
 
+_empty_atom_fields = {}  # (label, typesubtype, roles, morph, ents) -> encoded atom fields
+
 def _build_empty_atom(label, typesubtype, roles="", morph="", ents=""):
-    parts = [typesubtype, roles, morph, ents]
-    while parts and parts[-1] == "":
-        parts.pop()
-    return build_unique_atom(label, *parts)
+    # every empty atom must stay a distinct node, so only its encoded fields are shared
+    key = (label, typesubtype, roles, morph, ents)
+    fields = _empty_atom_fields.get(key)
+    if fields is None:
+        parts = [typesubtype, roles, morph, ents]
+        while parts and parts[-1] == "":
+            parts.pop()
+        fields = _empty_atom_fields[key] = tuple(build_unique_atom(label, *parts))
+    return UniqueAtom._fast(*fields)
+
+class _ParseState:
+    """
+    Bookkeeping shared by the hyperedge rules of a single `_main_parse` call.
+    """
+    __slots__ = ("beta", "predicates", "conjs", "cases", "alphas", "ent_codes")
+
+    def __init__(self, beta, predicates, conjs, cases, alphas, ent_codes):
+        self.beta = beta
+        self.predicates = predicates
+        self.conjs = conjs
+        self.cases = cases
+        self.alphas = alphas
+        self.ent_codes = ent_codes
+
+# SemHyP hyperedge rules, each called as
+# rule(state, child, parent, child_edge, parent_edge, child_type, parent_type)
+
+def _promote_predicate(st, tok, edge, tok_type):
+    """Wraps a predicate atom into its own (still open) edge the first time it takes part in a rule."""
+    if tok_type == "P" and tok not in st.predicates:
+        st.predicates[tok] = st.beta[tok] = edge = [edge]
+    return edge
+
+# Argument rules
+def _rule_argument(st, child, parent, child_edge, parent_edge, child_type, parent_type):
+    beta, predicates = st.beta, st.predicates
+    child_edge = _promote_predicate(st, child, child_edge, child_type)
+
+    if parent in predicates:                                
+        beta[parent] = parent_edge + [child_edge]           # E1.1    
+    else:
+        beta[parent] = [parent_edge, child_edge]            # E1.2
+    predicates[parent] = beta[parent]
+
+def _rule_comp_of_attribute(st, child, parent, child_edge, parent_edge, child_type, parent_type):
+    # E2.1 (parent is acomp or attr)
+    beta = st.beta
+    empty = _build_empty_atom("+", "Br", "am", ents=_get_entity_features(parent, child, codes=st.ent_codes))
+    child_edge = _promote_predicate(st, child, child_edge, child_type)
+    beta[parent] = [empty, parent_edge, child_edge]
+    # beta[parent] = Edge([build_unique_atom(":", "J"), parent_edge, child_edge])
+
+def _rule_comp_of_advmod(st, child, parent, child_edge, parent_edge, child_type, parent_type):
+    beta = st.beta
+    child_edge = _promote_predicate(st, child, child_edge, child_type)
+    beta[parent] = [parent_edge, child_edge]                                          # E2.2
+    #beta[parent] = Edge([build_unique_atom("+", "Br.ma"), parent_edge, child_edge])
+
+_COMP_RULES = {"acomp": _rule_comp_of_attribute,
+               "attr": _rule_comp_of_attribute,
+               "advmod": _rule_comp_of_advmod}
+
+def _rule_comp(st, child, parent, child_edge, parent_edge, child_type, parent_type):
+    rule = _COMP_RULES.get(parent.dep, _rule_argument)
+    rule(st, child, parent, child_edge, parent_edge, child_type, parent_type)
+
+def _is_predicate_modifier(st, parent):
+    return parent.pos in _PRED_POS and not st.alphas[_get_conj_closure(parent).i]
+
+def _rule_aux(st, child, parent, child_edge, parent_edge, child_type, parent_type):
+    st.beta[parent] = [child_edge, parent_edge]       # E3
+
+# Clausal rules
+def _rule_agent(st, child, parent, child_edge, parent_edge, child_type, parent_type):
+    beta, predicates = st.beta, st.predicates
+    if is_atom(parent_edge):
+        beta[parent] = [parent_edge, child_edge]      # E4.1
+    else:
+        if parent in predicates:
+            beta[parent] = parent_edge + [child_edge] # E4.2
+        else:
+            beta[parent] = [parent_edge, child_edge]  # E4.3
+    predicates[parent] = beta[parent]
+
+def _rule_clause(st, child, parent, child_edge, parent_edge, child_type, parent_type):
+    beta, predicates = st.beta, st.predicates
+    if child not in predicates:
+        predicates[child] = beta[child] = child_edge = [child_edge]
+    empty = _build_empty_atom("+", "Jr", "ma", ents=_get_entity_features(parent, child, codes=st.ent_codes))
+    beta[parent] = [empty, parent_edge, child_edge]                                           # E5
+
+# Coordination rules
+def _rule_conj(st, child, parent, child_edge, parent_edge, child_type, parent_type):
+    beta, conjs = st.beta, st.conjs
+    # check if child is an atom predicate (no args)
+    # if is_atom(child_edge) and types.get(child) == "P":
+    #     child_edge = predicates[child] = beta[child] = [child_edge]
+    if child not in conjs:
+        child_edge = _promote_predicate(st, child, child_edge, child_type)
+    if parent not in conjs:
+        parent_edge = _promote_predicate(st, parent, parent_edge, parent_type)
+
+    if parent in conjs and child in conjs:                
+        if parent.i < child.i:
+            beta[parent] = parent_edge + [child_edge]       # E6.1
+        else:
+            beta[parent] = child_edge + [parent_edge]       # E6.2
+            
+    elif parent in conjs and child not in conjs:
+        if child.i < parent.i:
+            beta[parent] = [parent_edge[0], child_edge, *parent_edge[1:]]     # E6.3
+        else:
+            beta[parent] = parent_edge + [child_edge]                         # E6.4
+        conjs[child] = child_edge
+
+    elif parent not in conjs and child in conjs:
+        if parent.i < child.i:
+            beta[parent] = [child_edge[0], parent_edge, *child_edge[1:]]           # E6.5
+        else:
+            beta[parent] = child_edge[0] + [parent_edge]                           # E6.6
+        conjs[parent] = parent_edge
+            
+    elif parent not in conjs and child not in conjs:
+        empty = _build_empty_atom(":", "J", ents=_get_entity_features(parent, child, codes=st.ent_codes))
+        beta[parent] = [empty, parent_edge, child_edge]                            # E6.7  
+        conjs[parent] = parent_edge
+        conjs[child] = child_edge
+
+def _rule_cc(st, child, parent, child_edge, parent_edge, child_type, parent_type):
+    beta, conjs = st.beta, st.conjs
+    if parent not in conjs:
+        parent_edge = _promote_predicate(st, parent, parent_edge, parent_type)
+
+    beta[parent] = [child_edge, parent_edge]                                       # E7
+    conjs[parent] = parent_edge
+
+def _rule_preconj(st, child, parent, child_edge, parent_edge, child_type, parent_type):
+    st.beta[parent] = [child_edge, parent_edge]                                    # E8
+
+# Relation rules
+def _rule_prep(st, child, parent, child_edge, parent_edge, child_type, parent_type):
+    beta = st.beta
+    if _is_predicate_modifier(st, parent):
+        _rule_argument(st, child, parent, child_edge, parent_edge, child_type, parent_type)
+    elif parent.dep == child.dep:
+        # special case
+        empty = _build_empty_atom(":", "J", ents=_get_entity_features(parent, child, codes=st.ent_codes))
+        if is_atom(child_edge):
+            beta[parent] = [empty, parent_edge, child_edge]                   # E9.1 first part
+        else:
+            beta[parent] = [empty, parent_edge, *child_edge]                  # E9.1 second part
+    else:
+        if is_atom(child_edge):
+            beta[parent] = [parent_edge, child_edge]                          # E9.2     
+        else:
+            beta[parent] = [child_edge[0], parent_edge, *child_edge[1:]]      # E9.3
+
+def _rule_mark(st, child, parent, child_edge, parent_edge, child_type, parent_type):
+    st.beta[parent] = [child_edge, parent_edge]                               # E10
+
+def _rule_object(st, child, parent, child_edge, parent_edge, child_type, parent_type):
+    st.beta[parent] = [parent_edge, child_edge]                               # E11
+
+def _rule_case(st, child, parent, child_edge, parent_edge, child_type, parent_type):
+    st.beta[parent] = [child_edge, parent_edge]                               # E12
+    st.cases.add(parent)                                                           
+
+# Nominal rules
+def _rule_poss(st, child, parent, child_edge, parent_edge, child_type, parent_type):
+    if child in st.cases:
+        st.beta[parent] = child_edge + [parent_edge]                         # E13.1
+    else:
+        st.beta[parent] = [child_edge, parent_edge]                          # E13.2
+
+def _rule_appos(st, child, parent, child_edge, parent_edge, child_type, parent_type):
+    empty = _build_empty_atom("+", "Ba", "ma", morph=_get_appos_features(child), ents=_get_entity_features(parent, child, codes=st.ent_codes))
+    st.beta[parent] = [empty, parent_edge, child_edge]                       # E14
+
+def _rule_compound(st, child, parent, child_edge, parent_edge, child_type, parent_type):
+    empty = _build_empty_atom("+", "B", "am", ents=_get_entity_features(parent, child, codes=st.ent_codes))
+    st.beta[parent] = [empty, child_edge, parent_edge]                       # E15
+
+# Modification rules
+def _rule_modifier(st, child, parent, child_edge, parent_edge, child_type, parent_type):
+    beta = st.beta
+    if parent_type == child_type == "C":
+        if parent.i < child.i:
+            empty = _build_empty_atom("+", "B", "ma", ents=_get_entity_features(parent, child, codes=st.ent_codes))
+            beta[parent] = [empty, parent_edge, child_edge]                 # E18.1
+        else:
+            empty = _build_empty_atom("+", "B", "am", ents=_get_entity_features(parent, child, codes=st.ent_codes))
+            beta[parent] = [empty, child_edge, parent_edge]                 # E18.2
+    elif parent_type == "C":
+        beta[parent] = [child_edge, parent_edge]                            # E18.3
+    elif child_type == "C":   
+        beta[parent] = [parent_edge, child_edge]                            # E18.4
+    else:
+        if child.i < parent.i:
+            beta[parent] = [child_edge, parent_edge]                        # E18.5
+        else:
+            beta[parent] = [parent_edge, child_edge]                        # E18.6
+
+def _rule_amod(st, child, parent, child_edge, parent_edge, child_type, parent_type):
+    if parent.dep != "prep":
+        _rule_modifier(st, child, parent, child_edge, parent_edge, child_type, parent_type)
+    elif child.i > parent.i:
+        st.beta[parent] = [parent_edge, child_edge] # as fast as possible   # E16.1
+    else:
+        #beta[parent] = Edge([parent_edge, child_edge])
+        st.beta[parent] = [child_edge, parent_edge]                         # E16.2
+
+def _rule_advmod(st, child, parent, child_edge, parent_edge, child_type, parent_type):
+    if _is_predicate_modifier(st, parent):
+        _rule_argument(st, child, parent, child_edge, parent_edge, child_type, parent_type)
+    else:
+        _rule_modifier(st, child, parent, child_edge, parent_edge, child_type, parent_type)
+
+def _rule_npadvmod(st, child, parent, child_edge, parent_edge, child_type, parent_type):
+    if _is_predicate_modifier(st, parent):
+        _rule_argument(st, child, parent, child_edge, parent_edge, child_type, parent_type)
+    elif parent.dep in _MARK_PREP_DEPS:
+        st.beta[parent] = [child_edge, parent_edge]                         # E17
+    else:
+        _rule_modifier(st, child, parent, child_edge, parent_edge, child_type, parent_type)
+
+def _rule_prt(st, child, parent, child_edge, parent_edge, child_type, parent_type):
+    st.beta[parent] = [child_edge, parent_edge]                             # E19
+    # beta[parent] = Edge([build_unique_atom(":", "J"), parent_edge, child_edge])
+
+def _rule_neg(st, child, parent, child_edge, parent_edge, child_type, parent_type):
+    st.beta[parent] = [child_edge, parent_edge]                             # E20
+
+# Residual rules
+def _rule_residual(st, child, parent, child_edge, parent_edge, child_type, parent_type):
+    if not parent_type == "P":
+        empty = _build_empty_atom(":", "J", ents=_get_entity_features(parent, child, codes=st.ent_codes))
+        st.beta[parent] = [empty, parent_edge, child_edge]                 # E21
+
+# dependency relation -> hyperedge rule
+_REL_RULES = {**dict.fromkeys(_CORE_ARG_DEPS, _rule_argument),
+              **dict.fromkeys(_COMP_DEPS, _rule_comp),
+              **dict.fromkeys(_AUX_DEPS, _rule_aux),
+              "agent": _rule_agent,
+              **dict.fromkeys(_CLAUSE_DEPS, _rule_clause),
+              "conj": _rule_conj,
+              "cc": _rule_cc,
+              "preconj": _rule_preconj,
+              "prep": _rule_prep,
+              "mark": _rule_mark,
+              **dict.fromkeys(_OBJ_DEPS, _rule_object),
+              "case": _rule_case,
+              "poss": _rule_poss,
+              "appos": _rule_appos,
+              "compound": _rule_compound,
+              **dict.fromkeys(_MOD_DEPS, _rule_modifier),
+              "amod": _rule_amod,
+              "advmod": _rule_advmod,
+              "npadvmod": _rule_npadvmod,
+              "prt": _rule_prt,
+              "neg": _rule_neg,
+              **dict.fromkeys(_RESIDUAL_DEPS, _rule_residual)}
 
 def _main_parse(sent, with_lemma=False, with_synset=False, debug=False):
     beta = {}
-    types = {}
+    sent_start, sent_end = sent.start, sent.end
+    types = [""] * (sent_end - sent_start)  # main type by token position in sent ("" for punct)
     atom2tok = {}
     tok2atom = {}
     trace = []
     hist = {}
     
-    token_seq = [item[1] for item in make_token_sequence(sent)]
+    alphas = _get_alphas(sent)
+    ent_codes = _get_entity_codes(sent)
+    verb_args = {}  # predicate token index -> (srl_toks, dep_toks), shared with the hidden-dependency pass
+    token_seq = make_token_sequence(sent, alphas)
     #print(token_seq)
     #token_seq[1], token_seq[-2] = token_seq[-2], token_seq[1]
     #print(token_seq)
 
     for child in token_seq:
-        parts = build_part(child)
+        parts = build_part(child, alphas, verb_args, ent_codes)
 
         label = child.lemma if with_lemma else child.text.lower()
         if with_synset and child.synset:
@@ -615,12 +997,16 @@ def _main_parse(sent, with_lemma=False, with_synset=False, debug=False):
         tok2atom[child] = atom
         beta[child] = atom
         hist[child] = [atom]
-        types[child] = atom.type()[0]
+        types[child.i - sent_start] = atom.type()[0]
 
     predicates = {}
     conjs = {}
     cases = set()
+    state = _ParseState(beta, predicates, conjs, cases, alphas, ent_codes)
 
+    beta_get = beta.get
+    hist_get = hist.get
+    rules_get = _REL_RULES.get
     for child in token_seq:
         rel = child.dep
         parent = child.head
@@ -633,9 +1019,12 @@ def _main_parse(sent, with_lemma=False, with_synset=False, debug=False):
             warnings.warn(f"{child} is probably punct.")
         
         child_edge = beta[child]
-        child_type = types[child]
-        parent_edge = beta.get(parent, build_unique_atom("?"))
-        parent_type = types.get(parent, "")
+        child_type = types[child.i - sent_start]
+        parent_edge = beta_get(parent)
+        if parent_edge is None:
+            parent_edge = build_unique_atom("?")
+        parent_i = parent.i
+        parent_type = types[parent_i - sent_start] if sent_start <= parent_i < sent_end else ""
         
         
         if debug:
@@ -644,204 +1033,25 @@ def _main_parse(sent, with_lemma=False, with_synset=False, debug=False):
 
 
         # SemHyP hyperedge rules 
-        
-        # Argument rules
-        if ((rel in {"nsubj", "nsubjpass", "dobj", "dative", "oprd",
-                     "acomp", "attr", "expl", "csubj", "csubjpass",
-                     "parataxis", "intj"}) or 
-            (rel in {"ccomp", "xcomp", "advcl"} and parent.dep not in {"acomp", "advmod", "attr"}) or
-            (parent.pos in {"VERB", "AUX", "MD"} and rel in {"advmod", "prep", "npadvmod"} and not alpha_condition(_get_conj_closure(parent)))):
-
-            if child_type == "P" and child not in predicates:                    
-                predicates[child] = beta[child] = child_edge = [child_edge]       
-
-            if parent in predicates:                                
-                beta[parent] = parent_edge + [child_edge]           # E1.1    
-            else:
-                beta[parent] = [parent_edge] + [child_edge]         # E1.2
-            predicates[parent] = beta[parent]
-                
-        elif rel in {"ccomp", "xcomp", "advcl"} and parent.dep == "acomp":               # E2.1 first part
-            empty = _build_empty_atom("+", "Br", "am", ents=_get_entity_features(parent, child))
-            if child_type == "P" and child not in predicates:
-                predicates[child] = beta[child] = child_edge = [child_edge]
-            beta[parent] = [empty, parent_edge, child_edge]
-            # beta[parent] = Edge([build_unique_atom(":", "J"), parent_edge, child_edge])
-        elif rel in {"ccomp", "xcomp", "advcl"} and parent.dep == "attr":               # E2.1 second part
-            empty = _build_empty_atom("+", "Br", "am", ents=_get_entity_features(parent, child))
-            if child_type == "P" and child not in predicates:
-                predicates[child] = beta[child] = child_edge = [child_edge]
-            beta[parent] = [empty, parent_edge, child_edge]
-        elif rel in {"ccomp", "xcomp", "advcl"} and parent.dep == "advmod":              # E2.2
-            if child_type == "P" and child not in predicates:
-                predicates[child] = beta[child] = child_edge = [child_edge]
-            beta[parent] = [parent_edge, child_edge]
-            #beta[parent] = Edge([build_unique_atom("+", "Br.ma"), parent_edge, child_edge])
-
-        elif rel in {"aux", "auxpass"}:
-            beta[parent] = [child_edge, parent_edge]       # E3
-
-        # Clausal rules
-        elif rel == "agent":
-            if is_atom(parent_edge):
-                beta[parent] = [parent_edge] + [child_edge]   # E4.1
-            else:
-                if parent in predicates:
-                    beta[parent] = parent_edge + [child_edge] # E4.2
-                else:
-                    beta[parent] = [parent_edge, child_edge]  # E4.3
-            predicates[parent] = beta[parent]
-
-        elif rel in {"acl", "relcl"}:
-            if child not in predicates:
-                predicates[child] = beta[child] = child_edge = [child_edge]
-            empty = _build_empty_atom("+", "Jr", "ma", ents=_get_entity_features(parent, child))
-            beta[parent] = [empty, parent_edge, child_edge]                                           # E5
-
-        # Coordination rules
-        elif rel == "conj":
-            # check if child is an atom predicate (no args)
-            # if is_atom(child_edge) and types.get(child) == "P":
-            #     child_edge = predicates[child] = beta[child] = [child_edge]
-            if child_type == "P" and child not in predicates and child not in conjs:
-                predicates[child] = beta[child] = child_edge = [child_edge]              
-            if parent_type == "P" and parent not in predicates and parent not in conjs:
-                predicates[parent] = beta[parent] = parent_edge = [parent_edge]              
-
-            if parent in conjs and child in conjs:                
-                if parent.i < child.i:
-                    beta[parent] = parent_edge + [child_edge]       # E6.1
-                else:
-                    beta[parent] = child_edge + [parent_edge]       # E6.2
-                    
-            elif parent in conjs and child not in conjs:
-                if child.i < parent.i:
-                    beta[parent] = [parent_edge[0]] + [child_edge] + parent_edge[1:]  # E6.3
-                else:
-                    beta[parent] = parent_edge + [child_edge]                         # E6.4
-                conjs[child] = child_edge
-
-            elif parent not in conjs and child in conjs:
-                if parent.i < child.i:
-                    beta[parent] = [child_edge[0]] + [parent_edge] + list(child_edge[1:])  # E6.5
-                else:
-                    beta[parent] = child_edge[0] + [parent_edge]                           # E6.6
-                conjs[parent] = parent_edge
-                    
-            elif parent not in conjs and child not in conjs:
-                empty = _build_empty_atom(":", "J", ents=_get_entity_features(parent, child))
-                beta[parent] = [empty, parent_edge, child_edge]                            # E6.7  
-                conjs[parent] = parent_edge
-                conjs[child] = child_edge
-                
-        elif rel == "cc":
-            if parent_type == "P" and parent not in predicates and parent not in conjs:
-                predicates[parent] = beta[parent] = parent_edge = [parent_edge]              
-
-            beta[parent] = [child_edge] + [parent_edge]                                    # E7
-            conjs[parent] = parent_edge
-
-        elif rel == "preconj":
-            beta[parent] = [child_edge] + [parent_edge]                                    # E8
-
-
-        # Relation rules
-        elif rel == "prep":
-            if parent.dep == child.dep:
-                # special case
-                empty = _build_empty_atom(":", "J", ents=_get_entity_features(parent, child))
-                if is_atom(child_edge):
-                    beta[parent] = [empty, parent_edge, child_edge]                   # E9.1 first part
-                else:
-                    beta[parent] = [empty, parent_edge] + child_edge                  # E9.1 second part
-            else:
-                if is_atom(child_edge):
-                    beta[parent] = [parent_edge] + [child_edge]                       # E9.2     
-                else:
-                    beta[parent] = [child_edge[0]] + [parent_edge] + child_edge[1:]   # E9.3
-            
-        elif rel == "mark":
-            beta[parent] = [child_edge, parent_edge]                                  # E10
+        rule = rules_get(rel)
+        if rule is not None:
+            rule(state, child, parent, child_edge, parent_edge, child_type, parent_type)
             
-        elif rel in {"pobj", "pcomp"}:
-            beta[parent] = [parent_edge, child_edge]                                  # E11
-        
-        elif rel == "case":
-            beta[parent] = [child_edge, parent_edge]                                  # E12
-            cases.add(parent)                                                           
-
-        # Nominal rules
-        elif rel == "poss":
-            if child in cases:
-                beta[parent] = child_edge + [parent_edge]                            # E13.1
-            else:
-                beta[parent] = [child_edge, parent_edge]                             # E13.2
-            
-        elif rel == "appos":
-            empty = _build_empty_atom("+", "Ba", "ma", morph=_get_appos_features(child), ents=_get_entity_features(parent, child))
-            beta[parent] = [empty, parent_edge, child_edge]                          # E14
-            
-        elif rel in "compound":
-            empty = _build_empty_atom("+", "B", "am", ents=_get_entity_features(parent, child))
-            beta[parent] = [empty, child_edge, parent_edge]                          # E15
-            
-
-
-        # Modification rules
-        elif rel in {"amod"} and parent.dep == "prep":  
-            if child.i > parent.i:
-                beta[parent] = [parent_edge, child_edge] # as fast as possible       # E16.1
-            else:
-                #beta[parent] = Edge([parent_edge, child_edge])
-                beta[parent] = [child_edge, parent_edge]                             # E16.2
-            
-        elif rel in {"npadvmod"} and parent.dep in {"mark", "prep"}:
-            beta[parent] = [child_edge, parent_edge]                                 # E17
-            
-            
-        elif rel in {"det", "predet", "amod", "advmod", "nmod", "nummod", "npadvmod", "quantmod"}:
-            if parent_type == child_type == "C":
-                if parent.i < child.i:
-                    empty = _build_empty_atom("+", "B", "ma", ents=_get_entity_features(parent, child))
-                    beta[parent] = [empty, parent_edge, child_edge]                 # E18.1
-                else:
-                    empty = _build_empty_atom("+", "B", "am", ents=_get_entity_features(parent, child))
-                    beta[parent] = [empty, child_edge, parent_edge]                 # E18.2
-            elif parent_type == "C":
-                beta[parent] = [child_edge, parent_edge]                            # E18.3
-            elif child_type == "C":   
-                beta[parent] = [parent_edge, child_edge]                            # E18.4
-            else:
-                if child.i < parent.i:
-                    beta[parent] = [child_edge, parent_edge]                        # E18.5
-                else:
-                    beta[parent] = [parent_edge, child_edge]                        # E18.6
-                
-        elif rel == "prt":
-            beta[parent] = [child_edge, parent_edge]                                # E19
-            # beta[parent] = Edge([build_unique_atom(":", "J"), parent_edge, child_edge])
-            
-        elif rel == "neg":
-            beta[parent] = [child_edge, parent_edge]                                # E20
-            
-
-            
-        # Residual rules
-        elif rel in {"dep", "meta"}:
-            if not parent_type == "P":
-                empty = _build_empty_atom(":", "J", ents=_get_entity_features(parent, child))
-                beta[parent] = [empty, parent_edge, child_edge]                    # E21
-            
-        if parent in hist and parent in beta:
-            hist[parent].append(beta[parent])
+        parent_hist = hist_get(parent)
+        if parent_hist is not None and parent in beta:
+            parent_hist.append(beta[parent])
             
         if debug:
             trace[-1]["4. new_edge"] = beta[parent]
             
     # process relation edge with argument not connected by dependency (hidden)
     found_hidden_dep = False
+    warns = []  # reported together after the pass
+    # id(edge) -> atoms of an open (list) edge; hist keeps the edges alive, and
+    # the index is dropped whenever an edge is mutated below
+    edge_atoms = {}
     for verb in predicates:  # predicates are ordered by their traversal 
-        half_empty_toks = _get_half_empty_toks(verb)
+        half_empty_toks = _get_half_empty_toks(verb, verb_args)
 
         if not half_empty_toks:
             continue
@@ -849,31 +1059,38 @@ def _main_parse(sent, with_lemma=False, with_synset=False, debug=False):
         for i, tok, kind in half_empty_toks:
             # find token edge
             if verb not in tok2atom:
-                warnings.warn(f"Hyperedge parser: verb {verb} hasn't dedicated hyperedge!")
+                warns.append(f"Hyperedge parser: verb {verb} hasn't dedicated hyperedge!")
                 continue
             verb_atom = tok2atom[verb]
 
             if tok not in hist:
-                warnings.warn(f"Hyperedge parser: token {tok} hasn't dedicated hyperedge!")
+                warns.append(f"Hyperedge parser: token {tok} hasn't dedicated hyperedge!")
                 continue
             for tok_edge in reversed(hist[tok]):
-                if not contains_atom(tok_edge, verb_atom):
+                atoms = edge_atoms.get(id(tok_edge))
+                if atoms is None:
+                    atoms = edge_atoms[id(tok_edge)] = _collect_atoms(tok_edge)
+                if verb_atom not in atoms:
                     break
                     
             # find verb edge
             verb_edge = predicates[verb] # beta[verb]
 
             if is_atom(verb_edge):                
-                warnings.warn(f"Hyperedge parser: hyperedge {verb_edge} is atom!")
+                warns.append(f"Hyperedge parser: hyperedge {verb_edge} is atom!")
                 #verb_edge = beta[verb] = predicates[verb] = [verb_edge]
                 continue
                         
             found_hidden_dep = True
             if kind == "dep":                
                 verb_edge.insert(i + 1, tok_edge)
+                edge_atoms.clear()
             elif kind == "srl":
                 pass
     
+    if warns:
+        warnings.warn("\n".join(warns))
+    
     # Edgify
     for tok in beta:
         beta[tok] = edgify(beta[tok])
@@ -904,16 +1121,35 @@ def _aux_parse(doc_or_sent, with_lemma=False, with_synset=False):
         # elif is_atom(edge):
         #     return edge
         
-        if isinstance(edge, type(src)) and edge == src:
+        src_type = type(src)
+        if isinstance(edge, src_type) and edge == src:
             return tgt
         elif is_atom(edge):
             return edge
 
-        edges = []
-        for subedge in edge:
-            e = replace_edge(subedge, src, tgt)
-            edges.append(e)
-        return Edge(edges)
+        # post-order walk; a subedge is rebuilt only if something below it was replaced
+        # frame: [edge, subedge iterator, new subedges, changed]
+        stack = [[edge, iter(edge), [], False]]
+        while stack:
+            frame = stack[-1]
+            for subedge in frame[1]:
+                if isinstance(subedge, src_type) and subedge == src:
+                    frame[2].append(tgt)
+                    frame[3] = True
+                elif is_atom(subedge):
+                    frame[2].append(subedge)
+                else:
+                    stack.append([subedge, iter(subedge), [], False])
+                    break
+            else:
+                stack.pop()
+                edge, _, edges, changed = frame
+                if changed:
+                    edge = Edge(edges)
+                if not stack:
+                    return edge
+                stack[-1][2].append(edge)
+                stack[-1][3] = stack[-1][3] or changed
 
     def find_span_root(span):
         # spacy's root of the span
@@ -929,36 +1165,42 @@ def _aux_parse(doc_or_sent, with_lemma=False, with_synset=False):
                 return tok
         assert False
 
-    def _get_all_atoms(edge):
-        atoms = []
-        def recursion(edge):
+    def _get_edge_tokens(root_edge):
+        # tokens covered by every subedge, built bottom-up in a single walk
+        order = []
+        stack = [root_edge]
+        while stack:
+            edge = stack.pop()
+            order.append(edge)
             if not is_atom(edge):
-                for subedge in edge:
-                    recursion(subedge)
+                stack.extend(edge)
+
+        edge_tokens = {}
+        get_token = atom2token.get  # one probe per atom
+        for edge in reversed(order):
+            if is_atom(edge):
+                tok = get_token(edge)
+                edge_tokens[id(edge)] = {tok} if tok is not None else set()
             else:
-                atoms.append(edge)
-        recursion(edge)
-        return atoms
+                tokens = set()
+                for subedge in edge:
+                    tokens |= edge_tokens[id(subedge)]
+                edge_tokens[id(edge)] = tokens
+        return edge_tokens
 
     def minimum_spanning_edge(edge, span):
-        span_tokens = {tok for tok in span if tok in atom2token.values()}
+        span_tokens = {tok for tok in span if tok in parsed_tokens}
+        tokens_by_edge = _get_edge_tokens(edge)
         root_edge = edge
         stack = [root_edge]
         while stack:
             edge = stack.pop()
 
-            edge_tokens = set()
-            for a in _get_all_atoms(edge):
-                if a in atom2token:
-                    edge_tokens.add(atom2token[a])
-
-
-            # edge_tokens = {atom2token[a] for a in _get_all_atoms(edge) if a in atom2token}
-
+            edge_tokens = tokens_by_edge[id(edge)]
             if span_tokens == edge_tokens:
                 return edge
             if not is_atom(edge):
-                stack += list(reversed(edge))
+                stack.extend(reversed(edge))
         return root_edge                
 
     sent2edge = {}
@@ -988,6 +1230,7 @@ def _aux_parse(doc_or_sent, with_lemma=False, with_synset=False):
         atom2token.update(res["atom2token"])
         beta.update(res["beta"])
         sent2edge[sent] = beta[sent.root]
+    parsed_tokens = set(atom2token.values())
 
     
     for spans in coreferences.values():
@@ -1,8 +1,9 @@
 import re
+import sys
 
 from .text import Doc, Span
 
-from collections import namedtuple
+from collections import namedtuple, defaultdict
 
 ColumnInfo = namedtuple("ColumnInfo", "i, name, type")
 COLUMN_DATA = {"sent_i": (0, "sent_i", int),
@@ -22,33 +23,31 @@ COLUMN_DATA = {"sent_i": (0, "sent_i", int),
 
 COLUMN_DATA = {col: ColumnInfo(*item) for col, item in COLUMN_DATA.items()}
 
+# positions of the fixed columns, resolved once at import
+_TOK_I_IDX = COLUMN_DATA["tok_i"].i
+_WORD_IDX = COLUMN_DATA["word"].i
+_SPACE_IDX = COLUMN_DATA["space"].i
+_LEMMA_IDX = COLUMN_DATA["lemma"].i
+_POS_IDX = COLUMN_DATA["pos"].i
+_TAG_IDX = COLUMN_DATA["tag"].i
+_DEP_IDX = COLUMN_DATA["dep"].i
+_HEAD_IDX = COLUMN_DATA["head"].i
+_REST_IDX = _HEAD_IDX + 1 # annotation columns follow head
+
 REGEXS = {"ner": r"[BI]-(CARDINAL|DATE|EVENT|FAC|GPE|LANGUAGE|LAW|LOC|MONEY|NORP|ORDINAL|ORG|PERCENT|PERSON|PRODUCT|QUANTITY|TIME|WORK_OF_ART)",
           "roleset": r"\w+\.\d\d",
           "srl": r"[BI](-[RC])?-(ARG0|ARG1|ARG2|ARG3|ARG4|ARG5|ARG6|ARGM-ADJ|ARGM-ADV|ARGM-CAU|ARGM-COM|ARGM-DIR|ARGM-DIS|ARGM-DSP|ARGM-EXT|ARGM-GOL|ARGM-LOC|ARGM-MNR|ARGM-MOD|ARGM-PNC|ARGM-PRD|ARGM-PRP|ARGM-REC|ARGM-TMP|V)",
           "coref": r"[BI]-(MAIN|REF)\d+",
           "synset": r"\w+\.\w\.\d\d",}
 
-for name in REGEXS:
-    REGEXS[name] = re.compile(REGEXS[name])
-
-def _convert_rows_to_columns(rows):
-    """
-    Converts a list of rows into a dictionary of columns.
+# empty cell markers, never matched by any column type
+PLACEHOLDERS = frozenset({"O", "-", "_"})
 
-    Args:
-        rows (list of list): The rows to convert.
-
-    Returns:
-        dict: A dictionary where keys are column indices and values are lists of column values.
-    """    
-    if not rows:
-        return {}
-    columns = {col_i: [] for col_i in range(len(rows[0]))}
+# one automaton for all column types; alternatives are tried in REGEXS order
+COLUMN_TYPE_REGEX = re.compile("|".join(f"(?P<{name}>{regex})" for name, regex in REGEXS.items()))
 
-    for items in rows:
-        for col_i, item in enumerate(items):
-            columns[col_i].append(item) 
-    return columns
+for name in REGEXS:
+    REGEXS[name] = re.compile(REGEXS[name])
 
 def _discover_column_types(columns):
     """
@@ -61,12 +60,15 @@ def _discover_column_types(columns):
         dict: A dictionary where keys are column indices and values are inferred types (ner, roleset, srl, coref, synset).
     """    
     column_type_by_i = {}
+    fullmatch = COLUMN_TYPE_REGEX.fullmatch
     for col_i, items in columns.items():
         for item in items:
-            for name, regex in REGEXS.items():
-                if regex.fullmatch(item):
-                    column_type_by_i[col_i] = name
-                    break    
+            if item in PLACEHOLDERS:
+                continue
+            match = fullmatch(item)
+            if match:
+                column_type_by_i[col_i] = match.lastgroup
+                break
     return column_type_by_i
 
 def _column_to_spans(sent_start, column):
@@ -82,16 +84,19 @@ def _column_to_spans(sent_start, column):
     """    
     span_start = label = None
     spans = []
-    column = [tag if tag.startswith(("B-", "I-")) else "O" for tag in column]
-    for row_i, item in enumerate(column + ["O"]):
-        if item.startswith(("B", "O")):
-            if span_start is not None:
-                spans.append((sent_start + span_start, sent_start + row_i, label))
-            if item.startswith("B"):
-                span_start = row_i
-                label = item[2:]
-            else:
-                span_start = label = None
+    for row_i, item in enumerate(column):
+        if item.startswith("I-"):
+            continue
+        # anything but "I-" closes the open span, "B-" also opens a new one
+        if span_start is not None:
+            spans.append((sent_start + span_start, sent_start + row_i, label))
+        if item.startswith("B-"):
+            span_start = row_i
+            label = sys.intern(item[2:])
+        else:
+            span_start = label = None
+    if span_start is not None:
+        spans.append((sent_start + span_start, sent_start + len(column), label))
     return spans
 
 def _column_to_set_ids(sent_start, column):
@@ -116,7 +121,7 @@ def txt2data(txt):
     Converts text data into a dictionary of columns.
 
     Args:
-        txt (str): The text data to convert.
+        txt (str or iterable of str): The text data to convert, or its lines.
 
     Returns:
         dict: A dictionary where keys are column names and values are lists of column values.
@@ -131,32 +136,42 @@ def txt2data(txt):
             for col in COLUMN_DATA 
             if COLUMN_DATA[col].name}
 
-    rest_items = {} # key is sent_start, values are rows
+    rest_columns = {} # key is sent_start, values are columns after head (col_i -> items)
+    columns = None
+    # locals are cheaper than module globals inside the row loop
+    tok_i, word_i, space_i, lemma_i = _TOK_I_IDX, _WORD_IDX, _SPACE_IDX, _LEMMA_IDX
+    pos_i, tag_i, dep_i, head_i, rest_i = _POS_IDX, _TAG_IDX, _DEP_IDX, _HEAD_IDX, _REST_IDX
+    words, spaces, lemmas = data["word"], data["space"], data["lemma"]
+    poses, tags, deps, heads = data["pos"], data["tag"], data["dep"], data["head"]
+    intern = sys.intern
     sent_start = 0
     tok_counter = 0
-    for line in txt.split("\n"):
+    lines = txt.split("\n") if isinstance(txt, str) else txt
+    for line in lines:
         if not line:
             continue
         if line[0].isnumeric():
-            items = line.split()
-            if items[COLUMN_DATA["tok_i"].i] == "0":
+            # fixed columns are split off, the annotation tail is split once more
+            items = line.split(None, rest_i)
+            rest = items.pop().split() if len(items) > rest_i else []
+            if items[tok_i] == "0":
                 sent_start = tok_counter
-                rest_items[sent_start] = []
-
-            data["word"].append(items[COLUMN_DATA["word"].i])
-            data["space"].append("+" == items[COLUMN_DATA["space"].i])
-            data["lemma"].append(items[COLUMN_DATA["lemma"].i])
-            data["pos"].append(items[COLUMN_DATA["pos"].i])
-            data["tag"].append(items[COLUMN_DATA["tag"].i])
-            data["dep"].append(items[COLUMN_DATA["dep"].i])
-            data["head"].append(sent_start + int(items[COLUMN_DATA["head"].i]))
-
-            rest_items[sent_start].append(items[COLUMN_DATA["head"].i + 1:])
+                columns = rest_columns[sent_start] = {col_i: [] for col_i in range(len(rest))}
+
+            words.append(items[word_i])
+            spaces.append("+" == items[space_i])
+            lemmas.append(items[lemma_i])
+            poses.append(items[pos_i])
+            tags.append(items[tag_i])
+            deps.append(items[dep_i])
+            heads.append(sent_start + int(items[head_i]))
+
+            for column, item in zip(columns.values(), rest):
+                column.append(intern(item))  # tags repeat heavily
             tok_counter += 1
 
 
-    for sent_start, rows in rest_items.items():
-        columns = _convert_rows_to_columns(rows)
+    for sent_start, columns in rest_columns.items():
         column_type_by_i = _discover_column_types(columns)
         
         # extract data from columns
@@ -173,7 +188,7 @@ def txt2data(txt):
                 set_ids = _column_to_set_ids(sent_start, column)
                 data[col_type] += set_ids
 
-    data["sent_start"] = sorted(rest_items)
+    data["sent_start"] = sorted(rest_columns)
     return data
 
 def data2doc(data):
@@ -210,42 +225,35 @@ def data2doc(data):
         doc[sent_start]._is_sent_start = sent_i
 
     # put ent in doc
-    doc.ent = []
-    for ents in data.get("ner", []):
-        for start, end, label in ents:
-            ent = Span(doc, start, end, label)
-            doc.ent.append(ent)
-    doc.ent = tuple(doc.ent)
+    doc.ent = tuple(Span.bulk(doc, (ent
+                                    for ents in data.get("ner", [])
+                                    for ent in ents)))
 
     # put srl in doc
     doc.srl = {}
     for srl_verb_args in data.get("srl", []):
-        verb, args = None, []
-        for start, end, label in srl_verb_args:
-            arg = Span(doc, start, end, label)
-            args.append(arg)
+        verb = None
+        for start, _, label in srl_verb_args:
             if label == "V":
-                verb = doc[start]
-        doc.srl[verb] = tuple(args)
+                verb = start
+        if verb is not None:
+            verb = doc[verb]
+        doc.srl[verb] = tuple(Span.bulk(doc, srl_verb_args))
 
     # put coref in doc
     doc.coref = {}
-    mains, refs = {}, {}
+    mains, refs = {}, defaultdict(list)
     for cluster in data.get("coref", []):
-        for start, end, label in cluster:
-            span = Span(doc, start, end, label)
-            if label.startswith("MAIN"):
-                i = int(label[4:])
-                mains[i] = span
-            elif label.startswith("REF"):
-                i = int(label[3:])
-                if i not in refs:
-                    refs[i] = [span]
-                else:
-                    refs[i].append(span)
+        for (_, _, label), span in zip(cluster, Span.bulk(doc, cluster)):
+            # labels are MAIN<i> or REF<i>, the first letter decides
+            kind = label[0]
+            if kind == "M":
+                mains[int(label[4:])] = span
+            elif kind == "R":
+                refs[int(label[3:])].append(span)
 
     for i, main in mains.items():
-        doc.coref[i] =(main, ) + tuple(refs.get(i, []))
+        doc.coref[i] = (main, *refs.get(i, ()))
 
     # put roleset
     for i, roleset in data.get("roleset", []):
@@ -258,18 +266,22 @@ def data2doc(data):
     return doc
 
 def read(filename, with_hypergraph=False):
+    hyperedge_lines = []
+
+    def _lines(fp):
+        # hyperedge comments are picked up while txt2data streams through the file
+        for line in fp:
+            if with_hypergraph and line.startswith("# hyperedge = "):
+                hyperedge_lines.append(line[14:].strip())
+            yield line
+
     with open(filename, "r", encoding="utf8") as fp:
-        txt = fp.read()
-        data = txt2data(txt)
-        doc = data2doc(data)
+        data = txt2data(_lines(fp))
+    doc = data2doc(data)
         
     if with_hypergraph:
         from .hyper import hedge
-        graph = []
-        for line in txt.split("\n"):
-            if line.startswith("# hyperedge = "):
-                line = line[14:].strip()
-                graph.append(hedge(line))
+        graph = [hedge(line) for line in hyperedge_lines]
         
         return doc, graph
     else:
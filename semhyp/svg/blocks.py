@@ -1,8 +1,23 @@
+import io
+from collections import deque
+
 from .elements import SVGElemArc, SVGElemText, SVGElemRectText, SVGElemLine, SVGElemCurvedLine
 from ..text import ANNOS, TOK_ANNOS, SPAN_ANNOS
-from ..hyper.hyperedge import Atom, UniqueAtom, Hyperedge 
+from ..hyper.hyperedge import Atom
+
+class SVGBlockBase():
+
+    def generate(self, dx=0, dy=0, buf=None):
+        if buf is None:
+            buf = io.StringIO()
+            self.generate(dx, dy, buf)
+            return buf.getvalue()
+        for elem in self._content:
+            buf.write(elem.generate(dx, dy))
+            buf.write("\n")
+
 
-class SVGBlockSent():
+class SVGBlockSent(SVGBlockBase):
 
     def __init__(self, owner, sent):
         self.owner = owner
@@ -14,14 +29,8 @@ class SVGBlockSent():
 
         self._content.append(SVGElemText(x=0, y=owner.font_height, value=str(sent), style={"font-weight": "bold"}))
 
-    def generate(self, dx=0, dy=0):
-        content = ""
-        for elem in self._content:
-            content += elem.generate(dx, dy) + "\n"
-        return content
 
-
-class SVGBlockSentAnno():
+class SVGBlockSentAnno(SVGBlockBase):
 
     @staticmethod
     def _sent_to_table(sent, annos):
@@ -33,26 +42,25 @@ class SVGBlockSentAnno():
         
         for anno in annos:
             values = [getattr(tok, anno) for tok in sent]
+            # tested once per value, reused for the skip test and the cells
+            others = [isinstance(val, str) and 
+                      hasattr(val, "is_other") and 
+                      val.is_other() 
+                      for val in values]
 
-            if all(isinstance(val, str) and 
-                   hasattr(val, "is_other") and 
-                   val.is_other() 
-                   for val in values):
+            if all(others):
                 continue
 
-            if all(isinstance(val, dict) for val in values):
+            if isinstance(values[0], dict) and all(isinstance(val, dict) for val in values):
                 size = max(len(val) for val in values)
                 table_annos += [anno] * size
             else:
                 table_annos.append(anno)
 
 
-            for column, val in zip(table, values):
+            for column, val, other in zip(table, values, others):
                 if isinstance(val, str):
-                    if hasattr(val, "is_other"):
-                        column.append(val if not val.is_other() else OTHER)
-                    else:
-                        column.append(val)
+                    column.append(val if not other else OTHER)
                 elif val is None:
                     column.append(NONE)
                 elif isinstance(val, dict):
@@ -107,7 +115,7 @@ class SVGBlockSentAnno():
 
         return table, table_annos
 
-    def __init__(self, owner, sent, show_spans=True, annos=None, style=None):
+    def __init__(self, owner, sent, show_spans=True, annos=None, style=None, sent_text=False):
         self.owner = owner
         self.style = style
         self._content = []
@@ -119,10 +127,6 @@ class SVGBlockSentAnno():
         
         # calc positions and sizes
         column_widths = [max(len(val) if isinstance(val, str) else len(val[0]) for val in column if val is not None) for column in table]
-        column_x_centers = [(sum(column_widths[:i])) * owner.font_width + (column_widths[i] * owner.font_width) // 2 
-                                  for i in range(len(column_widths))]
-        column_x_lefts = [(sum(column_widths[:i])) * owner.font_width for i in range(len(column_widths))]
-        column_w_lefts = [column_widths[i] * owner.font_width for i in range(len(column_widths))]
 
         #self.width = sum(column_widths) * owner.font_width
 
@@ -144,65 +148,60 @@ class SVGBlockSentAnno():
         # Total width is the sum of columns + (number of gaps * col_pad)
         self.width = sum(column_widths_px) + (len(column_widths) - 1) * owner.col_pad
 
+        # bold sentence line on top, the arcs and the table are laid out below it
+        text_height = 0
+        if sent_text:
+            value = str(sent)
+            self._content.append(SVGElemText(x=0, y=owner.font_height, value=value, style={"font-weight": "bold"}))
+            text_height = owner.font_height + owner.margin
+            self.width = max(self.width, len(value) * owner.font_width)
 
-        # draw dependency arcs
+        # draw dependency arcs, placed once the tallest arc is known
+        arcs = []
         self.dep_anno_border_height = 0
         for tok in sent:
             dest =  tok.i_by_sent
             src = tok.head.i_by_sent
             x1, x2 = column_x_centers[src], column_x_centers[dest]
             
-            elem = SVGElemArc(x1, x2, 0, owner.offset, tok.dep)
-            self._content.append(elem)
-            self.dep_anno_border_height = max(elem.get_height(owner.font_height), self.dep_anno_border_height)
+            arcs.append((x1, x2, tok.dep))
+            self.dep_anno_border_height = max(SVGElemArc.precompute_height(x1, x2, owner.offset, owner.font_height), 
+                                              self.dep_anno_border_height)
 
-        self.height = self.dep_anno_border_height + max(len(column) for column in table) * (owner.font_height + owner.row_pad)
+        table_top = text_height + self.dep_anno_border_height
+        self.height = table_top + max(len(column) for column in table) * (owner.font_height + owner.row_pad)
 
-        for elem in self._content:
-            elem.reset(y=self.dep_anno_border_height)
+        for x1, x2, dep in arcs:
+            self._content.append(SVGElemArc(x1, x2, table_top, owner.offset, dep))
 
         # draw text blocks
         for i, column in enumerate(table):
             for j, value in enumerate(column):
                 if isinstance(value, str):
                     self._content.append(SVGElemText(x=column_x_centers[i], 
-                                                    y=(self.dep_anno_border_height + (j + 1) * (owner.font_height + owner.row_pad)), 
+                                                    y=(table_top + (j + 1) * (owner.font_height + owner.row_pad)), 
                                                     value=value,
                                                     cls=f"center-text {table_annos[j]}"
                                                     ))
                 elif isinstance(value, tuple):
                     value, size = value
-                    w = sum(column_w_lefts[k] for k in range(i, i + size))
+                    w = sum(column_widths_px[i:i + size])
                     self._content.append(SVGElemRectText(x=column_x_lefts[i], 
-                                                         y=self.dep_anno_border_height + (j + 1) * (owner.font_height + owner.row_pad), 
+                                                         y=table_top + (j + 1) * (owner.font_height + owner.row_pad), 
                                                          w=w + owner.col_pad,
                                                          h=owner.font_height,
                                                          value=value,
                                                          text_cls=f"center-text {table_annos[j]}"))
 
-    def generate(self, dx=0, dy=0):
-        content = ""
-        for elem in self._content:
-            content += elem.generate(dx, dy) + "\n"
-        return content
 
-
-class SVGBlockHyperedge():
+class SVGBlockHyperedge(SVGBlockBase):
 
     @staticmethod    
     def _hypergraph_to_graph(edge):
 
-        def is_atom(item):
-            if isinstance(item, (Atom, UniqueAtom)):
-                return True
-            elif isinstance(item, Hyperedge):
-                return False
-            else:
-                raise Exception(f"{item} should be atom or hyperedge")
-
         def store2dict(nodes, item):
             if isinstance(item, Atom):
-                item = Atom(*item)
+                item = tuple.__new__(Atom, item)  # parts are already encoded
 
             if item in nodes:
                 return nodes[item]
@@ -210,7 +209,7 @@ class SVGBlockHyperedge():
             return nodes[item]
 
         def make_edge_role(edge):
-            if is_atom(edge):
+            if edge.is_atom():
                 return edge.to_str(with_label=False)
 
             et = edge.type()
@@ -231,27 +230,27 @@ class SVGBlockHyperedge():
                 "crosslinks": []}
         
         nodes = {}
-        stack = [edge]
+        stack = deque([edge])
         visited = set()
         while stack:
-            parent = stack.pop(0)  # BFS - use deque
+            parent = stack.popleft()  # BFS
             if parent.is_atom():
                 parent_i = store2dict(nodes, parent)
                 continue
             
             parent_i = store2dict(nodes, parent[0])
             for child in parent[1:]:
-                if not is_atom(child) and child[0].type()[0] in ("J", "B"):
+                if not child.is_atom() and child[0].type()[0] in ("J", "B"):
                     child_i = store2dict(nodes, child[0])
                     rel = make_edge_role(child[0])
-                    stack += [child]
-                elif child.type()[0] in ("C", "P", "M") or is_atom(child):
+                    stack.append(child)
+                elif child.type()[0] in ("C", "P", "M") or child.is_atom():
                     child_i = store2dict(nodes, child)
                     rel = make_edge_role(child)
                 else:
                     child_i = store2dict(nodes, child[0])
                     rel = make_edge_role(child[0])
-                    stack += [child]
+                    stack.append(child)
 
                 # triples from graph with repeated child store in extra links
                 if child_i not in visited:
@@ -273,7 +272,7 @@ class SVGBlockHyperedge():
             data["nodes"][i] = {"text": str(node.simplify()),
                                 "type": node.type()[0]}
 
-        root_role = make_edge_role(edge if is_atom(edge) else edge[0])
+        root_role = make_edge_role(edge if edge.is_atom() else edge[0])
         data["links"].append((0, 0, root_role))
 
         return data
@@ -288,12 +287,13 @@ class SVGBlockHyperedge():
             if parent_i == child_i:
                 root_links.append((rel, parent_i))
             else:
-                children[parent_i] = children.get(parent_i, []) + [(rel, child_i)]
+                children.setdefault(parent_i, []).append((rel, child_i))
                 parents[child_i] = (rel, parent_i)
         root_is = set(graph["nodes"]) - set(parents)
 
 
-        def _traverse(parent_i, offx=0, depth=0):
+        def _place(parent_i, offx, depth, children_occ, children_xy, children_rels):
+            # position a node once all of its children are placed
             parent = graph["nodes"][parent_i]
 
             parent_rel, _ = parents.get(parent_i, ("", parent_i))
@@ -302,15 +302,6 @@ class SVGBlockHyperedge():
             rel_w = len(parent_rel) * sizes["link_font_width"]
             parent_w = max(text_w, rel_w)
 
-            children_occ = 0
-            children_xy = []
-            children_rels = []
-            for child_rel, child_i in children.get(parent_i, []):
-                child = _traverse(child_i, children_occ + offx, depth + 1)
-                children_occ += child["occupy"] + sizes["node_font_width"]
-                children_xy.append((child["x"] + child["w"] // 2, child["y"]))
-                children_rels.append(child_rel)
-
             parent_occ = max(children_occ, parent_w)
             
             parent.update({"occupy": parent_occ,
@@ -334,6 +325,24 @@ class SVGBlockHyperedge():
 
             return parent
 
+        def _traverse(root_i, offx=0):
+            # depth-first, children left to right; each child starts where its previous siblings end
+            # frame: [node, offx, depth, pending children, children_occ, children_xy, children_rels]
+            stack = [[root_i, offx, 0, iter(children.get(root_i, [])), 0, [], []]]
+            while stack:
+                frame = stack[-1]
+                parent_i, offx, depth, pending, children_occ, children_xy, children_rels = frame
+                for child_rel, child_i in pending:
+                    children_rels.append(child_rel)
+                    stack.append([child_i, children_occ + offx, depth + 1, iter(children.get(child_i, [])), 0, [], []])
+                    break
+                else:
+                    stack.pop()
+                    child = _place(parent_i, offx, depth, children_occ, children_xy, children_rels)
+                    if stack:
+                        stack[-1][4] += child["occupy"] + sizes["node_font_width"]
+                        stack[-1][5].append((child["x"] + child["w"] // 2, child["y"]))
+
         graph["links"].clear()
         for root_i in root_is:
             _traverse(root_i, offx=10)
@@ -420,11 +429,3 @@ class SVGBlockHyperedge():
             
             self.width = max(self.width, node["x"] + node["w"])
             self.height = max(self.height, node["y"] + node["h"])
-
-
-    def generate(self, dx=0, dy=0):
-        content = ""
-        for elem in self._content:
-            content += elem.generate(dx, dy) + "\n"
-        return content
-
@@ -1,27 +1,64 @@
-import html
+import math
+from functools import lru_cache
+
+# same mapping as html.escape(s, quote=True), applied in a single pass
+_HTML_ESCAPE = str.maketrans({"&": "&amp;",
+                              "<": "&lt;",
+                              ">": "&gt;",
+                              '"': "&quot;",
+                              "'": "&#x27;"})
+_ESC_CHARS = frozenset("&<>\"'")
+
+# fixed element markup, filled with %-formatting
+_TEXT_TMPL = '<text x="%s" y="%s" %s %s>%s</text>'
+
+_RECT_TMPL = ('<rect x="%s" y="%s" width="%s" height="%s" rx="%s" stroke="black" stroke-width="0.5" fill="white" %s %s />\n'
+              '<text x="%s" y="%s" %s %s>%s</text>')
+
+_LINE_TMPL = '<line x1="%s" y1="%s" x2="%s" y2="%s" stroke="black" stroke-width="0.5" fill="none" marker-end="url(#arrowhead)" />'
+
+_LINE_LABEL_TMPL = '<text x="%s" y="%s" class="center-text" font-size="%s">%s</text>'
+
+_CURVE_TMPL = '<path d="M %s,%s Q %s,%s %s,%s" stroke="black" stroke-width="0.5" stroke-dasharray="5, 5" fill="none" marker-end="url(#arrowhead)" />'
+
+_CURVE_LABEL_TMPL = '<text x="%s" y="%s" class="center-text" font-size="75%%">%s</text>'
+
+_ARC_TMPL = '<path d="M %s %s A %s %s 0 0 %s %s %s" stroke="black" stroke-width="0.5" fill="none" marker-end="url(#arrowhead)" />\n'
+
+_ROOT_ARC_TMPL = '<path d="M %s %s L %s %s" stroke="black" stroke-width="0.5" fill="none" marker-end="url(#arrowhead)" />\n'
+
+_ARC_LABEL_TMPL = '<text x="%s" y="%s" class="center-text">%s</text>'
+
+@lru_cache(maxsize=4096)  # labels such as dep, POS and entity types repeat a lot
+def _esc(s):
+    if _ESC_CHARS.isdisjoint(s):
+        return s  # nothing to escape, keep the original string
+    return s.translate(_HTML_ESCAPE)
 
 class SVGElemBase():
 
+    __slots__ = ("cls", "style", "_class_frag", "_style_frag")
+
     def __init__(self, cls=None, style=None):
         self.cls = cls
         self.style = style
+        # class and style do not change after construction
+        self._class_frag = f' class="{cls}" ' if cls else ""
+        self._style_frag = (' style="' + "; ".join(f"{attr}: {val}" for attr, val in style.items()) + '" '
+                            if style else "")
 
     def generate_class(self, cls=None):
-        if not cls and not self.cls:
-            return ""    
-        cls = cls or self.cls
+        if not cls:
+            return self._class_frag
         return f' class="{cls}" '
 
     def generate_style(self):
-        if not self.style:
-            return ""
-        svg = []
-        for attr, val in self.style.items():
-            svg.append(f"{attr}: {val}")
-        return ' style="' + "; ".join(svg) + '" '
+        return self._style_frag
 
 class SVGElemText(SVGElemBase):
 
+    __slots__ = ("x", "y", "value")
+
     def __init__(self, x, y, value, cls=None, style=None):
         super().__init__(cls, style)
         self.x = x
@@ -35,13 +72,12 @@ class SVGElemText(SVGElemBase):
         return font_height
 
     def generate(self, dx=0, dy=0):
-        x = self.x + dx
-        y = self.y + dy
-        value = html.escape(self.value)
-        return f'<text x="{x}" y="{y}" {self.generate_class()} {self.generate_style()}>{value}</text>'
+        return _TEXT_TMPL % (self.x + dx, self.y + dy, self._class_frag, self._style_frag, _esc(self.value))
 
 class SVGElemRectText(SVGElemBase):
 
+    __slots__ = ("x", "y", "w", "h", "value", "text_cls", "rect_cls", "_text_class_frag", "_rect_class_frag")
+
     def __init__(self, x, y, w, h, value, text_cls=None, rect_cls=None, style=None):
         super().__init__(None, style)
         self.x = x
@@ -51,22 +87,22 @@ class SVGElemRectText(SVGElemBase):
         self.value = value
         self.text_cls=text_cls
         self.rect_cls=rect_cls
+        self._text_class_frag = self.generate_class(text_cls)
+        self._rect_class_frag = self.generate_class(rect_cls)
 
     def generate(self, dx=0, dy=0):
         x = self.x + dx
         y = self.y + dy
         w = self.w
         h = self.h
-        value = html.escape(self.value)
-        
-        svg = f'<rect x="{x}" y="{y - h + 0.25 * h}" width="{w}" height="{h}" rx="{h * 0.2}" stroke="black" stroke-width="0.5" fill="white" {self.generate_class(self.rect_cls)} {self.generate_style()} />\n'
-        #svg += f'<text="50%" y="50%" text-anchor="middle">{value}</text>'
-        svg += f'<text x="{x + w / 2}" y="{y}" {self.generate_class(self.text_cls)} {self.generate_style()}>{value}</text>'
-        #svg += f'<rect x="10" y="10" width="100" height="50" stroke="black" stroke-width="0.5" fill="none" />\n'
-        return svg
+        style = self._style_frag
+        return _RECT_TMPL % (x, y - h + 0.25 * h, w, h, h * 0.2, self._rect_class_frag, style,
+                             x + w / 2, y, self._text_class_frag, style, _esc(self.value))
 
 class SVGElemLine(SVGElemBase):
 
+    __slots__ = ("x1", "y1", "x2", "y2", "font_height", "start_value", "end_value")
+
     def __init__(self, x1, y1, x2, y2, font_height=None, start_value=None, end_value=None, cls=None, style=None):
         super().__init__(cls, style)
         self.x1 = x1
@@ -89,20 +125,21 @@ class SVGElemLine(SVGElemBase):
             dist_y = abs(y1 - y2)
             font_height = dist_y * 0.3
 
-        start_value = html.escape(self.start_value)
-        end_value = html.escape(self.end_value)
+        start_value = _esc(self.start_value)
+        end_value = _esc(self.end_value)
 
-        svg = f'<line x1="{x1}" y1="{y1}" x2="{x2}" y2="{y2}" stroke="black" stroke-width="0.5" fill="none" marker-end="url(#arrowhead)" />'
+        svg = _LINE_TMPL % (x1, y1, x2, y2)
         if start_value:
-            svg += f'<text x="{x1}" y="{y1 + font_height*0.25}" class="center-text" font-size="{font_height}">{end_value}</text>'
+            svg += _LINE_LABEL_TMPL % (x1, y1 + font_height*0.25, font_height, end_value)
 
         if end_value:
-            svg += f'<text x="{x2}" y="{y2 - font_height*0.25}" class="center-text" font-size="{font_height}">{end_value}</text>'
+            svg += _LINE_LABEL_TMPL % (x2, y2 - font_height*0.25, font_height, end_value)
 
         return svg
     
 class SVGElemCurvedLine(SVGElemLine):
 
+    __slots__ = ()
 
     def _calculate(self, dx=0, dy=0):        
         x1 = self.x1 + dx
@@ -110,7 +147,7 @@ class SVGElemCurvedLine(SVGElemLine):
         x2 = self.x2 + dx
         y2 = self.y2 + dy
 
-        dist = ((x1 - x2) ** 2 + (y1 - y2) ** 2) ** 0.5
+        dist = math.hypot(x1 - x2, y1 - y2)
         d = dist * 0.15
 
         cx = (x1 + x2) / 2
@@ -127,13 +164,9 @@ class SVGElemCurvedLine(SVGElemLine):
     def get_boundary_box(self, dx=0, dy=0):
         (x1, y1), (cx, cy), (x2, y2), font_height = self._calculate(dx, dy)
 
-        def parametric_curve_point(t):
-            xt = (1 - t) ** 2 * x1 + 2 * (1 - t) * t * cx + t ** 2 * x2
-            yt = (1 - t) ** 2 * y1 + 2 * (1 - t) * t * cy + t ** 2 * y2
-            return xt, yt
-
-        max_t = (y1 - cy) / (y1 - 2 * cy + y2)
-        _, max_yt = parametric_curve_point(max_t)
+        # B_y(t) = y1 + 2t(cy - y1) + t^2(y1 - 2cy + y2) peaks where B_y'(t) = 0
+        curvature = y1 - 2 * cy + y2
+        max_yt = y1 - (cy - y1) ** 2 / curvature if curvature else y1
 
         min_x, max_x = min(x1, x2), max(x1, x2)
         min_y, max_y = min(y1, y2, max_yt), max(y1, y2, max_yt)
@@ -143,23 +176,25 @@ class SVGElemCurvedLine(SVGElemLine):
     def generate(self, dx=0, dy=0):
         (x1, y1), (cx, cy), (x2, y2), font_height = self._calculate(dx, dy)
 
-        start_value = html.escape(self.start_value)
-        end_value = html.escape(self.end_value)
-        svg = f'<path d="M {x1},{y1} Q {cx},{cy} {x2},{y2}" stroke="black" stroke-width="0.5" stroke-dasharray="5, 5" fill="none" marker-end="url(#arrowhead)" />'
+        start_value = _esc(self.start_value)
+        end_value = _esc(self.end_value)
+        svg = _CURVE_TMPL % (x1, y1, cx, cy, x2, y2)
 
         if start_value:
-            svg += f'<text x="{x1}" y="{y1 + font_height*0.75}" class="center-text" font-size="75%">{start_value}</text>'
+            svg += _CURVE_LABEL_TMPL % (x1, y1 + font_height*0.75, start_value)
 
         if end_value:
-            svg += f'<text x="{x2}" y="{y2 + font_height*0.75}" class="center-text" font-size="75%">{end_value}</text>'
+            svg += _CURVE_LABEL_TMPL % (x2, y2 + font_height*0.75, end_value)
         #svg = f'<line x1="{x1}" y1="{y1}" x2="{x2}" y2="{y2}" stroke="black" stroke-width="0.5" fill="none" marker-end="url(#arrowhead)" />'
         return svg
 
 class SVGElemArc(SVGElemBase):
 
+    __slots__ = ("x1", "x2", "y", "offset", "value")
+    root_arc_height = 50
+
     def __init__(self, x1, x2, y, offset, value, cls=None, style=None):
         super().__init__(None, style)
-        self.root_arc_height = 50
         self.x1 = x1
         self.x2 = x2
         self.y = y
@@ -180,13 +215,18 @@ class SVGElemArc(SVGElemBase):
             w_arc = abs(x1 - x2) - self.offset 
             return max(w_arc, w_text)
 
-    def get_height(self, font_height):
-        if self.x1 == self.x2:
-            return self.root_arc_height + self.offset + font_height
+    @classmethod
+    def precompute_height(cls, x1, x2, offset, font_height):
+        """Height of an arc between x1 and x2, known before the arc is placed."""
+        if x1 == x2:
+            return cls.root_arc_height + offset + font_height
         
-        rx = (abs(self.x1 - self.x2) - self.offset) / 2
-        ry = (rx - self.offset) * 0.6
-        return ry + self.offset + font_height
+        rx = (abs(x1 - x2) - offset) / 2
+        ry = (rx - offset) * 0.6
+        return ry + offset + font_height
+
+    def get_height(self, font_height):
+        return self.precompute_height(self.x1, self.x2, self.offset, font_height)
 
     def generate(self, dx, dy):
         x1 = self.x1 + dx
@@ -194,26 +234,26 @@ class SVGElemArc(SVGElemBase):
         y = self.y + dy
 
         offset = self.offset
-        value = html.escape(self.value)
+        value = _esc(self.value)
 
         rx = (abs(x1 - x2) - offset) / 2
         ry = (rx - offset) * 0.6
         
         svg = ""
         if x1 == x2:
-            svg += f'<path d="M {x1} {y - self.root_arc_height} L {x1} {y}" stroke="black" stroke-width="0.5" fill="none" marker-end="url(#arrowhead)" />\n'
+            svg += _ROOT_ARC_TMPL % (x1, y - self.root_arc_height, x1, y)
             ry  = self.root_arc_height
         elif x1 > x2:
             x1 -= offset
-            svg += f'<path d="M {x1} {y} A {rx} {ry} 0 0 0 {x2} {y}" stroke="black" stroke-width="0.5" fill="none" marker-end="url(#arrowhead)" />\n'
+            svg += _ARC_TMPL % (x1, y, rx, ry, 0, x2, y)
         else:
             x1 += offset
-            svg += f'<path d="M {x1} {y} A {rx} {ry} 0 0 1 {x2} {y}" stroke="black" stroke-width="0.5" fill="none" marker-end="url(#arrowhead)" />\n'
+            svg += _ARC_TMPL % (x1, y, rx, ry, 1, x2, y)
         
         # draw dep
         xt = min(x1, x2) + (abs(x1 - x2)) / 2
         yt = y - ry - offset
 
-        svg += f'<text x="{xt}" y="{yt}" class="center-text">{value}</text>'
+        svg += _ARC_LABEL_TMPL % (xt, yt, value)
 
         return svg        
@@ -9,10 +9,66 @@ Imports:
     Token: The Token class for handling individual tokens.
     Span: The Span class for handling spans within documents.
 """
+from operator import itemgetter
+
 from .vocab import Vocab
 from .token import Token
 from .span import Span
 
+class _AnnoDict(dict):
+    """
+    A span annotation dict owned by a Doc, which drops the doc's start index for it on every change.
+    """
+    __slots__ = ("_doc", "_anno")
+
+    def __init__(self, doc, anno, items=()):
+        super().__init__(items)
+        self._doc = doc
+        self._anno = anno
+
+    def _changed(self):
+        self._doc._start_indexes.pop(self._anno, None)
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._changed()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._changed()
+
+    def __ior__(self, other):
+        super().__ior__(other)
+        self._changed()
+        return self
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+    def clear(self):
+        super().clear()
+        self._changed()
+
+    def pop(self, *args):
+        value = super().pop(*args)
+        self._changed()
+        return value
+
+    def popitem(self):
+        item = super().popitem()
+        self._changed()
+        return item
+
+    def setdefault(self, key, default=None):
+        value = super().setdefault(key, default)
+        self._changed()
+        return value
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._changed()
+
+
 class Doc:
     """
     A class for handling documents, providing methods for token and span management.
@@ -45,12 +101,15 @@ class Doc:
         tokens = []
         if spaces is None:
             spaces = [True] * len(words)
+        put_text = self.vocab.put_text
         for i, (word, space) in enumerate(zip(words, spaces)):
-            self.vocab.put_text(word)
-            tok = Token(self, word, space)
+            tok = Token._fast(self, put_text(word), space)
             tok.i = i
             tokens.append(tok)
         self._tokens = tuple(tokens)
+        self._sent_starts = None
+        self._children = None
+        self._start_indexes = {}
 
         self.ents = tuple()
         self.srl = {}
@@ -111,9 +170,104 @@ class Doc:
                 start = num_tokens + start
             if end < 0:
                 end = num_tokens + end
-            return Span(self, start, end)
+            return Span.fast(self, start, end)
         return self._tokens[i]
 
+    def _get_sent_starts(self):
+        """
+        Returns the sorted indices of sentence-start tokens, rescanned only after a token's start flag changes.
+        """
+        if self._sent_starts is None:
+            self._sent_starts = [t.i for t in self._tokens if t._sent_start is not False]
+        return self._sent_starts
+
+    def _get_children(self):
+        """
+        Returns (lefts, rights), the dependents of each token on either side within its sentence, rebuilt only after a head or sentence start changes.
+        """
+        if self._children is None:
+            tokens = self._tokens
+            lefts = [[] for _ in tokens]
+            rights = [[] for _ in tokens]
+            sent_starts = self._get_sent_starts()
+            bounds = sent_starts if sent_starts and sent_starts[0] == 0 else [0] + sent_starts
+            for sent_start, sent_end in zip(bounds, bounds[1:] + [len(tokens)]):
+                for tok in tokens[sent_start:sent_end]:
+                    head = tok._head
+                    if head is None or not sent_start <= head < sent_end:
+                        continue
+                    if tok.i < head:
+                        lefts[head].append(tok)
+                    elif tok.i > head:
+                        rights[head].append(tok)
+            self._children = ([tuple(c) for c in lefts], [tuple(c) for c in rights])
+        return self._children
+
+    # span annotations are owned by the doc (ent as a tuple, srl and coref as dicts
+    # that report their changes), so that any change drops their start index
+
+    @property
+    def ent(self):
+        return self._ent
+
+    @ent.setter
+    def ent(self, value):
+        self._ent = tuple(value)
+        self._start_indexes.pop("ent", None)
+
+    @property
+    def srl(self):
+        return self._srl
+
+    @srl.setter
+    def srl(self, value):
+        self._srl = _AnnoDict(self, "srl", value)
+        self._start_indexes.pop("srl", None)
+
+    @property
+    def coref(self):
+        return self._coref
+
+    @coref.setter
+    def coref(self, value):
+        self._coref = _AnnoDict(self, "coref", value)
+        self._start_indexes.pop("coref", None)
+
+    def _start_index_items(self, anno):
+        """
+        Yields (start token index, item) pairs of a span annotation, in annotation order.
+        """
+        if anno == "ent":
+            for ent in self.ent:
+                yield ent.start, ent
+        elif anno == "srl":
+            for verb in self.srl:
+                if verb is not None:
+                    yield verb.i, verb
+        elif anno == "coref":
+            for i, spans in self.coref.items():
+                for span in spans:
+                    yield span.start, (i, span)
+
+    def _in_range(self, anno, start, end):
+        """
+        Returns the items of a span annotation (ent, srl or coref) starting within [start, end), in annotation order.
+
+        The index is built on first use and dropped whenever the annotation changes.
+        """
+        by_start = self._start_indexes.get(anno)
+        if by_start is None:
+            by_start = {}
+            for rank, (i, item) in enumerate(self._start_index_items(anno)):
+                by_start.setdefault(i, []).append((rank, item))
+            self._start_indexes[anno] = by_start
+
+        hits = []
+        for i in range(start, end):
+            hits.extend(by_start.get(i, ()))
+        hits.sort(key=itemgetter(0))
+        return [item for _, item in hits]
+
     def __unicode__(self):
         return "".join([t.text_with_ws for t in self])
 
@@ -139,17 +293,12 @@ class Doc:
             ['How', 'are', 'you', '?']
         """        
         sent_start = 0
-        sent_counter = 1
-        for t in self:
-            if t.is_sent_start and t.i > sent_start:
-                # print(sent_start, t.i)
-                yield Span(self, sent_start, t.i, str(self[sent_start].sent_i))
-                sent_start = t.i
-                sent_counter += 1
+        for start in self._get_sent_starts():
+            if start > sent_start:
+                yield Span(self, sent_start, start, str(self[sent_start].sent_i))
+                sent_start = start
         if self._tokens and sent_start < self[-1].i:
-            # print(sent_start, self[-1].i)
             yield Span(self, sent_start, self[-1].i + 1, str(self[sent_start].sent_i))
-            sent_counter += 1
     
     def reduce(self, with_srl=True, with_coref=True, with_ner=True):
 
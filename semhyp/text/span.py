@@ -7,6 +7,18 @@ class Span(SpanBase):
 
     def __new__(cls, doc, start, end, label=None):
         return super().__new__(cls, doc, start, end, doc.vocab.put_text(label))
+
+    @classmethod
+    def bulk(cls, doc, triples):
+        """Builds spans of doc from (start, end, label) triples in one pass."""
+        put_text = doc.vocab.put_text
+        new = tuple.__new__
+        return [new(cls, (doc, start, end, put_text(label))) for start, end, label in triples]
+
+    @classmethod
+    def fast(cls, doc, start, end):
+        """Builds an unlabeled span of doc without going through the vocab."""
+        return tuple.__new__(cls, (doc, start, end, None))
         
     def __getitem__(self, i):
         if i < 0:
@@ -27,21 +39,21 @@ class Span(SpanBase):
                 return tok
 
     def __contains__(self, tok):
-        for i in range(self.start, self.end):
-            if self.doc[i] == tok:
-                return True
-        return False
+        # tokens are unique per doc position, so membership is a range test
+        try:
+            return tok.doc is self.doc and self.start <= tok.i < self.end
+        except AttributeError:
+            return False
 
     def __iter__(self):
-        for i in range(self.start, self.end):
-            yield self.doc[i]
+        return iter(self.doc._tokens[self.start:self.end])
 
     @property
     def text(self):
-        return "".join(self.doc[i].text_with_ws for i in range(self.start, self.end)).strip()
+        return "".join([t.text_with_ws for t in self.doc._tokens[self.start:self.end]]).strip()
 
     def __unicode__(self):
-        txt = "".join(self.doc[i].text_with_ws for i in range(self.start, self.end))
+        txt = "".join([t.text_with_ws for t in self.doc._tokens[self.start:self.end]])
         txt = txt.strip()
         if self.label:
             txt = f"{self.label}: {txt}"
@@ -62,17 +74,17 @@ class Span(SpanBase):
 
     @property
     def ent(self):
-        ents = []
-        for ent in self.doc.ent:
-            if  self.start <= ent.start < ent.end <= self.end:
-                ents.append(ent)
-        return tuple(ents)
+        return tuple(ent 
+                     for ent in self.doc._in_range("ent", self.start, self.end)
+                     if ent.start < ent.end <= self.end)
 
     @property
     def srl(self):
         srl_verb_args = {}
-        for verb, args in self.doc.srl.items():
-            if verb in self and all(self.contains(arg) for arg in args):
+        doc_srl = self.doc.srl
+        for verb in self.doc._in_range("srl", self.start, self.end):
+            args = doc_srl[verb]
+            if all(self.contains(arg) for arg in args):
                 srl_verb_args[verb] = args
         return srl_verb_args
 
@@ -80,8 +92,7 @@ class Span(SpanBase):
     @property
     def coref(self):
         coref_dict = {}
-        for i, doc_spans in self.doc.coref.items():
-            sent_spans = tuple(span for span in doc_spans if self.contains(span))
-            if sent_spans:
-                coref_dict[i] = sent_spans
-        return coref_dict
+        for i, span in self.doc._in_range("coref", self.start, self.end):
+            if self.contains(span):
+                coref_dict.setdefault(i, []).append(span)
+        return {i: tuple(spans) for i, spans in coref_dict.items()}
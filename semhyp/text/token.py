@@ -1,3 +1,5 @@
+from bisect import bisect_right
+
 from .span import Span
 from .util import IOBTag
 
@@ -5,15 +7,40 @@ from .util import IOBTag
 
 class Token:
 
+    # one slot per Doc.STR_ANNOS and Doc.NONE_ANNOS annotation, no per-token __dict__
+    __slots__ = ("i", "doc", "_text", "_space", "_sent_start",
+                 "_lemma", "_pos", "_tag", "_dep", "_head",
+                 "_roleset", "_synset")
+
     def __init__(self, doc, word, space=True):
+        self._init(doc, doc.vocab.put_text(word), space)
+
+    @classmethod
+    def _fast(cls, doc, text_id, space=True):
+        """Builds a token from a word already interned in doc.vocab."""
+        tok = cls.__new__(cls)
+        tok._init(doc, text_id, space)
+        return tok
+
+    def _init(self, doc, text_id, space):
         self.i = None
         self.doc = doc
-        self._text = self.doc.vocab.put_text(word)
+        self._text = text_id
         self._space = space
-        self._is_sent_start = False
+        self._sent_start = False
+
+        self._lemma = self._pos = self._tag = self._dep = self._head = None
+        self._roleset = self._synset = None
 
-        for anno in self.doc.STR_ANNOS + self.doc.NONE_ANNOS:
-            setattr(self, "_" + anno, None)
+    @property
+    def _is_sent_start(self):
+        # False, or the sentence number if the token starts a sentence
+        return self._sent_start
+
+    @_is_sent_start.setter
+    def _is_sent_start(self, value):
+        self._sent_start = value
+        self.doc._sent_starts = self.doc._children = None  # sentence boundaries changed
 
     @property
     def i_by_sent(self):
@@ -24,7 +51,7 @@ class Token:
         
     @property
     def is_sent_start(self):
-        return self._is_sent_start is not False
+        return self._sent_start is not False
     
     @property
     def sent_i(self):
@@ -93,6 +120,7 @@ class Token:
             self._head = value
         elif isinstance(value, Token):
             self._head = value.i
+        self.doc._children = None
 
     @property
     def text_with_ws(self):
@@ -102,31 +130,20 @@ class Token:
     
     @property
     def sent(self):
-        sent_start, sent_end = 0, len(self.doc)
-        i = self.i
-        while i > sent_start and not self.doc[i].is_sent_start:
-            i -= 1
-        sent_start = i
-
-        i = self.i + 1
-        while i < sent_end and not self.doc[i].is_sent_start:
-            i += 1
-        sent_end = i
-
+        sent_starts = self.doc._get_sent_starts()
+        k = bisect_right(sent_starts, self.i)
+        sent_start = sent_starts[k - 1] if k else 0
+        sent_end = sent_starts[k] if k < len(sent_starts) else len(self.doc)
 
         return Span(self.doc, sent_start, sent_end, label=str(self.doc[sent_start].sent_i))
     
     @property 
     def lefts(self):
-        for child in self.sent:
-            if child.i < self.i and child.head.i == self.i:
-                yield child
+        yield from self.doc._get_children()[0][self.i]
 
     @property 
     def rights(self):
-        for child in self.sent:
-            if child.i > self.i and child.head.i == self.i:
-                yield child
+        yield from self.doc._get_children()[1][self.i]
 
     @property
     def children(self):
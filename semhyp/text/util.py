@@ -1,44 +1,66 @@
 class IOBTag(str):
 
+    # str subclasses cannot take non-empty __slots__, the split is cached in the instance dict
+    def _split(self):
+        try:
+            return self._parts
+        except AttributeError:
+            iob, sep, tag = self.partition("-")
+            self._parts = (iob if sep else self, tag)
+            return self._parts
+
     @property
     def iob(self):
-        i = self.find("-")
-        if i >= 0:
-            return self[:i]
-        return self
+        return self._split()[0]
 
     @property
     def tag(self):
-        i = self.find("-")
-        if i >= 0:
-            return self[i + 1:]
-        return ""
+        return self._split()[1]
 
     @staticmethod
     def create(iob, tag=""):
         if tag != "":
-            return IOBTag(f"{iob}-{tag}")
-        return IOBTag(iob)
+            return _joined_tag(iob, tag)
+        return _bare_tag(iob)
 
     @staticmethod
     def single(lbl):
-        return IOBTag(f"S-{lbl}")
+        return _joined_tag("S", lbl)
 
     @staticmethod
     def begin(lbl):
-        return IOBTag(f"B-{lbl}")
+        return _joined_tag("B", lbl)
 
     @staticmethod
     def inside(lbl):
-        return IOBTag(f"I-{lbl}")
+        return _joined_tag("I", lbl)
 
     @staticmethod
     def end(lbl):
-        return IOBTag(f"E-{lbl}")
+        return _joined_tag("E", lbl)
 
     @staticmethod
     def other():
-        return IOBTag("O")
+        return _OTHER
     
     def is_other(self):
-        return self == "O"
\ No newline at end of file
+        return self == "O"
+
+
+# tags are immutable, so each distinct (iob, label) is built once and shared
+_IOB_CACHE = {}
+
+def _joined_tag(iob, lbl):
+    key = (iob, lbl)
+    tag = _IOB_CACHE.get(key)
+    if tag is None:
+        tag = _IOB_CACHE[key] = IOBTag(f"{iob}-{lbl}")
+    return tag
+
+def _bare_tag(iob):
+    tag = _IOB_CACHE.get(iob)
+    if tag is None:
+        tag = _IOB_CACHE[iob] = IOBTag(iob)
+    return tag
+
+_OTHER = _bare_tag("O")
@@ -1,19 +1,30 @@
-class Vocab(dict):
+class Vocab:
+
+    def __init__(self):
+        self._s2i = {}
+        self._i2s = []
 
     def put_text(self, text):
+        # known texts (mostly repeated labels) return before any validation
+        try:
+            i = self._s2i.get(text)
+        except TypeError:  # unhashable, so certainly not a string
+            raise Exception("annotation is not string") from None
+        if i is not None:
+            return i
+
         if text is None:
             return None
         if not isinstance(text, str):
             raise Exception("annotation is not string")
 
-        if text in self:
-            return self[text]
-        
-        i = len(self) // 2
-        self[text] = i
-        self[i] = text
+        i = len(self._i2s)
+        self._i2s.append(text)
+        self._s2i[text] = i
         return i
-    
+
     def __getitem__(self, key):
-        if key in self:
-            return super().__getitem__(key)
+        if isinstance(key, str):
+            return self._s2i.get(key)
+        if key is not None and 0 <= key < len(self._i2s):
+            return self._i2s[key]
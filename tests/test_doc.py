@@ -0,0 +1,48 @@
+import unittest
+
+from semhyp.text.doc import Doc
+from semhyp.text.span import Span
+
+
+def make_doc():
+    doc = Doc(["Alice", "saw", "Bob", ".", "She", "left", "."])
+    doc.ent = ()
+    doc.srl = {}
+    doc.srl[doc[1]] = (Span(doc, 0, 1, "ARG0"), Span(doc, 2, 3, "ARG1"))
+    doc.srl[doc[5]] = (Span(doc, 4, 5, "ARG0"),)
+    doc.coref = {}
+    doc.coref[0] = (Span(doc, 0, 1), Span(doc, 4, 5))
+    return doc
+
+
+class TestSpanAnnotationIndex(unittest.TestCase):
+
+    def test_coref_replaced_in_place(self):
+        doc = make_doc()
+        span = doc[0:len(doc)]
+        self.assertEqual(span.coref, {0: (Span(doc, 0, 1), Span(doc, 4, 5))})
+
+        doc.coref[0] = doc.coref[0][:1]
+        self.assertEqual(span.coref, {0: (Span(doc, 0, 1),)})
+
+    def test_srl_verb_swapped_in_place(self):
+        doc = make_doc()
+        span = doc[0:len(doc)]
+        self.assertEqual(set(span.srl), {doc[1], doc[5]})
+
+        args = doc.srl[doc[1]]
+        del doc.srl[doc[1]]
+        doc.srl[doc[0]] = args
+        self.assertEqual(span.srl, {doc[5]: doc.srl[doc[5]], doc[0]: args})
+
+    def test_ent_reassigned(self):
+        doc = make_doc()
+        span = doc[0:3]
+        self.assertEqual(span.ent, ())
+
+        doc.ent = [Span(doc, 2, 3, "PERSON")]
+        self.assertEqual(span.ent, (Span(doc, 2, 3, "PERSON"),))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,23 @@
+import unittest
+
+from semhyp.drawer import SVGCanvas
+
+
+class TestSVGCanvasColors(unittest.TestCase):
+
+    def test_changed_color_is_drawn(self):
+        canvas = SVGCanvas(16, 16 * 0.6, 5)
+        canvas.colors["word"] = "red"
+        svg = canvas.generate()
+        self.assertIn(".word {fill: red}", svg)
+        self.assertNotIn(".word {fill: black}", svg)
+
+    def test_changed_color_stays_on_its_canvas(self):
+        canvas = SVGCanvas(16, 16 * 0.6, 5)
+        canvas.colors["word"] = "red"
+        self.assertEqual(SVGCanvas.default_colors["word"], "black")
+        self.assertIn(".word {fill: black}", SVGCanvas(16, 16 * 0.6, 5).generate())
+
+
+if __name__ == "__main__":
+    unittest.main()